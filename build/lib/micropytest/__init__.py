@@ -0,0 +1 @@
+__version__ = "0.20.0"
\ No newline at end of file
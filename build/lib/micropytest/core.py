@@ -0,0 +1,896 @@
+import copy
+import logging
+import logging.handlers
+import queue
+import sys
+import os
+import json
+import traceback
+import inspect
+import threading
+import time
+import weakref
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from fnmatch import fnmatch
+from os import PathLike
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Iterator, Optional, Union
+import importlib.util
+try:
+    import orjson  # optional, faster reading and writing of .micropytest.json
+except ImportError:
+    orjson = None
+from .parameters import Args
+from .progress import TestProgress
+from .stats import TestStats
+from .types import Test, TestAttributes, TestResult
+from . import __version__
+
+
+CONFIG_FILE = ".micropytest.json"
+TIME_REPORT_CUTOFF = 0.01 # dont report timings below this
+SKIPPED_DIRS = {".git", "node_modules"}  # directories that are never searched for tests
+SKIPPED_DIR_PARTS = ("venv", "site-packages", "__pycache__")  # ... and directories with these in their name
+LOG_FLUSH_INTERVAL = 0.2  # seconds between flushes of console logs when stdout is not interactive
+PARALLEL_SAFE_TAG = "parallel_safe"  # tests with this tag may run concurrently with each other (see run_tests)
+
+# absolute test file path -> ((mtime_ns, size), module)
+_test_modules_cache: dict[str, tuple[tuple[int, int], Any]] = {}
+
+# absolute test file path -> (module, [(name, function), ...]), valid while the module is the one in _test_modules_cache
+_test_functions_cache: dict[str, tuple[Any, list[tuple[str, Any]]]] = {}
+
+# function -> whether it accepts any parameters (weak keys, so that functions of reloaded modules can be freed)
+_has_parameters_cache: weakref.WeakKeyDictionary[Any, bool] = weakref.WeakKeyDictionary()
+
+# absolute .micropytest.json path -> ((mtime_ns, size), data)
+_lastrun_cache: dict[str, tuple[tuple[int, int], dict]] = {}
+
+
+class SkipTest(Exception):
+    """
+    Raised by a test to indicate it should be skipped.
+    """
+    pass
+
+class LiveFlushingStreamHandler(logging.StreamHandler):
+    """
+    A stream handler that flushes logs immediately, giving real-time console output.
+
+    If batch_queue is given (the queue the records are taken from), the stream is only flushed when the queue is
+    empty, i.e. once for the last record of a burst instead of after every record.
+    If the stream is not interactive (e.g. output is piped to a file in CI), records are flushed by a background
+    thread every flush_interval seconds instead of after every record, which avoids a write per log line.
+    """
+    def __init__(self, stream=None, flush_interval=LOG_FLUSH_INTERVAL, batch_queue=None):
+        super(LiveFlushingStreamHandler, self).__init__(stream)
+        self.flush_interval = flush_interval
+        self.batch_queue = batch_queue
+        self._flush_immediately = _is_interactive(self.stream)
+        self._flush_thread = None
+        self._stop_flush_thread = threading.Event()
+
+    def emit(self, record):
+        # same as StreamHandler.emit, but flushing is decided below
+        try:
+            msg = self.format(record)
+            self.stream.write(msg + self.terminator)
+        except RecursionError:
+            raise
+        except Exception:
+            self.handleError(record)
+            return
+        if self._flush_immediately:
+            if self.batch_queue is None or self.batch_queue.empty():
+                self.flush()  # end of batch
+        elif self._flush_thread is None:
+            self._flush_thread = threading.Thread(target=self._flush_periodically, daemon=True)
+            self._flush_thread.start()
+
+    def _flush_periodically(self):
+        while not self._stop_flush_thread.wait(self.flush_interval):
+            self.flush()
+
+    def close(self):
+        self._stop_flush_thread.set()
+        self.flush()
+        super(LiveFlushingStreamHandler, self).close()
+
+
+class LiveConsoleHandler(logging.handlers.QueueHandler):
+    """
+    Console log handler that only enqueues records, they are formatted and written to the stream by a background
+    thread (using a LiveFlushingStreamHandler that flushes at the end of each batch of records).
+
+    Only use this for streams that nothing else writes to (e.g. not sys.stdout while tests print()), since records
+    are written later from another thread. Call flush() to wait until all enqueued records were written.
+    """
+    def __init__(self, stream=None):
+        super(LiveConsoleHandler, self).__init__(queue.Queue())
+        self.target = LiveFlushingStreamHandler(stream, batch_queue=self.queue)
+        self.listener = logging.handlers.QueueListener(self.queue, self.target)
+        self.listener.start()
+        self._listener_running = True
+
+    def prepare(self, record):
+        # merge args into the message now (they might change before the record is written), the rest of the
+        # formatting is done by the target handler on the listener thread
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+    def setFormatter(self, fmt):
+        self.target.setFormatter(fmt)
+
+    def flush(self):
+        self.queue.join()
+        self.target.flush()
+
+    def close(self):
+        if self._listener_running:
+            self._listener_running = False
+            self.listener.stop()
+        self.target.close()
+        super(LiveConsoleHandler, self).close()
+
+
+def _is_interactive(stream) -> bool:
+    try:
+        return stream.isatty()
+    except Exception:
+        return False
+
+
+def _use_colors(stream) -> bool:
+    """Colorize console logs only on a terminal, unless overridden with the NO_COLOR or FORCE_COLOR env variables."""
+    if os.environ.get("NO_COLOR"):
+        return False
+    if os.environ.get("FORCE_COLOR"):
+        return True
+    return _is_interactive(stream)
+
+
+def create_live_console_handler(formatter=None, level=logging.INFO, stream=None):
+    """Create a console log handler writing to stream (default: sys.stdout).
+
+    Logs to sys.stdout and sys.stderr are written synchronously to keep them in order with print() in tests, other
+    streams are written by a background thread.
+    """
+    if stream is None or stream is sys.stdout or stream is sys.stderr:
+        handler = LiveFlushingStreamHandler(stream=sys.stdout if stream is None else stream)
+    else:
+        handler = LiveConsoleHandler(stream=stream)
+    if formatter:
+        handler.setFormatter(formatter)
+    handler.setLevel(level)
+    return handler
+
+
+class TestContext:
+    """
+    A context object passed to each test if it accepts 'ctx'.
+    Allows logging via ctx.debug(), etc., storing artifacts (key-value store), and skipping tests.
+
+    Set max_log_records (e.g. in a subclass) to only keep the most recent log records in memory, which limits the
+    memory used by tests that log heavily. Dropped records are not included in the result and its warning/error counts,
+    their number is available as dropped_log_records (and TestResult.dropped_logs).
+    """
+    max_log_records: Optional[int] = None
+
+    def __init__(self):
+        self.log_records: Union[list[logging.LogRecord], deque[logging.LogRecord]] = self._new_log_records()
+        self.log = logging.getLogger()
+        self.artifacts: dict[str, Any] = {}
+        # mark log records emitted through this context, so they can be attributed to it when running concurrently
+        self._log_extra = {"micropytest_ctx_id": id(self)}
+
+    def debug(self, msg):
+        self.log.debug(msg, extra=self._log_extra)
+
+    def info(self, msg):
+        self.log.info(msg, extra=self._log_extra)
+
+    def warn(self, msg):
+        self.log.warning(msg, extra=self._log_extra)
+
+    def error(self, msg):
+        self.log.error(msg, extra=self._log_extra)
+
+    def fatal(self, msg):
+        self.log.critical(msg, extra=self._log_extra)
+
+    def add_artifact(self, key: str, value: Any):
+        self.artifacts[key] = value
+
+    def add_log(self, record: logging.LogRecord):
+        if self._log_records_limit is not None and len(self.log_records) == self._log_records_limit:
+            self.dropped_log_records += 1  # the deque drops the oldest record to make room for this one
+        self.log_records.append(record)
+
+    def _new_log_records(self):
+        """Create the container for the log records of a test run (a bounded deque if max_log_records is set)."""
+        self.dropped_log_records = 0
+        self._log_records_limit = self.max_log_records
+        if self.max_log_records is None:
+            return []
+        return deque(maxlen=self.max_log_records)
+
+    def add_artifact_file(self, key: str, path: PathLike):
+        with open(path, "rb") as f:
+            self.add_artifact(key, f.read())
+
+    def skip_test(self, msg=None):
+        """
+        Tests can call this to be marked as 'skipped', e.g. if the environment
+        doesn't apply or prerequisites are missing.
+        """
+        raise SkipTest(msg or "Test was skipped by ctx.skip_test(...)")
+
+    def get_logs(self):
+        return self.log_records
+
+    def get_artifacts(self):
+        return self.artifacts
+
+    def finish(self):
+        """Custom function that is called after a test was run."""
+        pass
+
+
+class GlobalContextLogHandler(logging.Handler):
+    """
+    A handler that captures all logs into a single test's context log_records,
+    so we can show them in a final summary or store them.
+
+    If thread_id is given (used when tests run concurrently), only records that were emitted by the given thread
+    or through the context (e.g. from a thread started by the test) are captured.
+    """
+    def __init__(self, ctx, formatter=None, thread_id=None):
+        logging.Handler.__init__(self)
+        self.ctx = ctx
+        self.thread_id = thread_id
+        if formatter:
+            self.setFormatter(formatter)
+
+    def emit(self, record):
+        if self.thread_id is not None and record.thread != self.thread_id:
+            if getattr(record, "micropytest_ctx_id", None) != id(self.ctx):
+                return
+        self.ctx.add_log(record)
+
+
+class SimpleLogFormatter(logging.Formatter):
+    """
+    Format logs with a timestamp and level, e.g.:
+    HH:MM:SS LEVEL|LOGGER| message
+    """
+    def __init__(self, use_colors=True):
+        super().__init__()
+        self.use_colors = use_colors
+        self._last_timestamp = (None, "")  # (second, formatted local time), records often share the same second
+
+    def format(self, record):
+        has_colorama = False
+        if self.use_colors:
+            try:
+                from colorama import Fore, Style
+                has_colorama = True
+            except ImportError:
+                pass
+
+        second = int(record.created)
+        last_second, tstamp = self._last_timestamp
+        if second != last_second:
+            tstamp = time.strftime("%H:%M:%S", time.localtime(second))
+            self._last_timestamp = (second, tstamp)
+        level = record.levelname
+        origin = record.name
+        message = record.getMessage()
+
+        color = ""
+        reset = ""
+        if self.use_colors and has_colorama:
+            if level in ("ERROR", "CRITICAL"):
+                color = Fore.RED
+            elif level == "WARNING":
+                color = Fore.YELLOW
+            elif level == "DEBUG":
+                color = Fore.MAGENTA
+            elif level == "INFO":
+                color = Fore.CYAN
+            reset = Style.RESET_ALL
+
+        return f"{color}{tstamp} {level:8s}|{origin:11s}| {message}{reset}"
+
+
+def load_test_module_by_path(file_path):
+    """
+    Dynamically import a Python file as a module, so we can discover test_* functions.
+    The module is cached per process and reused as long as the file is not modified.
+    """
+    return _load_test_module(file_path)[1]
+
+
+def _load_test_module(file_path) -> tuple[str, Any]:
+    """Return the cache key (absolute path) and the imported module of a test file (see load_test_module_by_path)."""
+    key, version = _file_version(file_path)
+    cached = _test_modules_cache.get(key)
+    if cached is not None and cached[0] == version:
+        return key, cached[1]
+    spec = importlib.util.spec_from_file_location("micropytest_dynamic", file_path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    _test_modules_cache[key] = (version, module)
+    return key, module
+
+
+def _file_version(file_path) -> tuple[str, tuple[int, int]]:
+    """Return the cache key (absolute path) and version (modification time and size) of a file."""
+    stat = os.stat(file_path)
+    return os.path.abspath(file_path), (stat.st_mtime_ns, stat.st_size)
+
+
+def load_test_functions(file_path) -> list[tuple[str, Any]]:
+    """
+    Import a test file and return its (name, function) pairs of test_* functions.
+    Results are cached per process and reused as long as the file is not modified (i.e. the module is not reloaded).
+    """
+    key, mod = _load_test_module(file_path)
+    cached = _test_functions_cache.get(key)
+    if cached is not None and cached[0] is mod:
+        return cached[1]
+    functions = []
+    for attr in dir(mod):
+        if attr.startswith("test_"):
+            fn = getattr(mod, attr)
+            if callable(fn):
+                functions.append((attr, fn))
+    _test_functions_cache[key] = (mod, functions)
+    return functions
+
+
+def clear_discovery_cache():
+    """Forget cached test modules and functions, so that all test files are imported again when needed."""
+    _test_functions_cache.clear()
+    _test_modules_cache.clear()
+    _has_parameters_cache.clear()
+
+
+def find_test_files(start_dir="."):
+    """
+    Recursively find all *.py that match test_*.py or *_test.py,
+    excluding typical venv, site-packages, or __pycache__ folders.
+    This will also exclude patterns from .micropytestignore files.
+    If start_dir is a single test file, only that file is returned.
+    """
+    if os.path.isfile(start_dir):
+        return [start_dir] if _is_test_file_name(os.path.basename(start_dir)) else []
+    test_files = []
+    ignore_patterns = []
+    for root, dirs, files in os.walk(start_dir):
+        # prune skipped directories in place, so that os.walk does not descend into them
+        dirs[:] = [d for d in dirs if not _is_skipped_dir(d)]
+        for f in files:
+            if _is_test_file_name(f):
+                test_files.append(os.path.join(root, f))
+            if f == ".micropytestignore":
+                patterns = read_ignore_patterns(os.path.join(root, f))
+                ignore_patterns.extend([os.path.join(root, pattern) for pattern in patterns])
+
+    test_files_used = []
+    for test_file in test_files:
+        if not any(fnmatch(test_file, ignore_pattern) for ignore_pattern in ignore_patterns):
+            test_files_used.append(test_file)
+
+    return test_files_used
+
+
+def _is_skipped_dir(name):
+    return name in SKIPPED_DIRS or any(part in name for part in SKIPPED_DIR_PARTS)
+
+
+def _is_test_file_name(name):
+    return (name.startswith("test_") or name.endswith("_test.py")) and name.endswith(".py")
+
+
+def read_ignore_patterns(file_path):
+    with open(os.path.join(file_path), "r") as f:
+        lines = []
+        for line in f:
+            line = line.strip()
+            if line and not line.startswith("#"):
+                lines.append(line)
+        return lines
+
+
+def discover_tests(
+    discover_ctx, tests_path, test_filter=None, tag_filter=None, exclude_tags=None, import_workers=1
+) -> list[Test]:
+    """Discover all test functions in the given directory and subdirectories."""
+    return list(discover_tests_iter(discover_ctx, tests_path, test_filter, tag_filter, exclude_tags, import_workers))
+
+
+def discover_tests_iter(
+    discover_ctx, tests_path, test_filter=None, tag_filter=None, exclude_tags=None, import_workers=1
+) -> Iterator[Test]:
+    """Like discover_tests, but yield tests one by one as soon as they are discovered."""
+    test_files = find_test_files(tests_path)
+    yield from iter_test_functions(discover_ctx, test_files, test_filter, tag_filter, exclude_tags, import_workers)
+
+
+def find_test_functions(
+    discover_ctx, test_files, test_filter=None, tag_filter=None, exclude_tags=None, import_workers=1
+) -> list[Test]:
+    """Find all test functions in the given test files."""
+    return list(iter_test_functions(discover_ctx, test_files, test_filter, tag_filter, exclude_tags, import_workers))
+
+
+def iter_test_functions(
+    discover_ctx, test_files, test_filter=None, tag_filter=None, exclude_tags=None, import_workers=1
+) -> Iterator[Test]:
+    """Find all test functions in the given test files, yielding them one by one.
+
+    If import_workers > 1, the test files are imported concurrently in that many threads (tests are still yielded
+    in the order of the files). Only use this if the test files can be imported outside the main thread.
+    """
+
+    tag_set = tags_to_set(tag_filter)
+    exclude_tag_set = tags_to_set(exclude_tags)
+
+    executor = None
+    if import_workers > 1 and len(test_files) > 1:
+        executor = ThreadPoolExecutor(max_workers=import_workers)
+        futures = [executor.submit(load_test_functions, f) for f in test_files]
+        loaded_functions = (future.result() for future in futures)
+    else:
+        loaded_functions = (load_test_functions(f) for f in test_files)
+
+    try:
+        yield from _iter_matching_tests(discover_ctx, test_files, loaded_functions, test_filter, tag_set, exclude_tag_set)
+    finally:
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+
+def _iter_matching_tests(discover_ctx, test_files, loaded_functions, test_filter, tag_set, exclude_tag_set):
+    for f, functions in zip(test_files, loaded_functions):
+        # Note: errors that happen during the test discovery phase (e.g. import errors) cannot be suppressed
+        # because those errors would not be attributed to a specific test. This would mean that some tests would be
+        # unexpectedly skipped in case of programming errors, without any indication of what went wrong.
+        for attr, fn in functions:
+            # Get tags from the function if they exist
+            tags = getattr(fn, '_tags', set())
+
+            # Apply test filter if provided
+            name_match = not test_filter or test_filter in attr
+
+            # Apply tag filter if provided
+            tag_match = not tag_set or (tags and tag_set.intersection(tags))
+
+            # Apply exclude tag filter if provided
+            exclude_match = exclude_tag_set and tags and exclude_tag_set.intersection(tags)
+
+            if name_match and tag_match and not exclude_match:
+                if hasattr(fn, '_argument_generator'):
+                    if not _has_parameters(fn._argument_generator):
+                        args_list = fn._argument_generator()
+                    else:
+                        discover_ctx.test = TestAttributes(file=f, name=attr, function=fn, tags=tags)
+                        args_list = fn._argument_generator(discover_ctx)
+                    if len(args_list) == 0:
+                        pass  # ignore this test because no arguments were generated
+                    else:
+                        for args in args_list:
+                            if not isinstance(args, Args):
+                                f = fn.__name__
+                                raise ValueError(f"Argument generator of '{f}' returned a non-Args object")
+                            yield Test(file=f, name=attr, function=fn, tags=tags, args=args)
+                else:
+                    yield Test(file=f, name=attr, function=fn, tags=tags, args=Args())
+
+
+def tags_to_set(list_or_str):
+    """Convert a list or string to a set."""
+    if list_or_str:
+        return {list_or_str} if isinstance(list_or_str, str) else set(list_or_str)
+    return set()
+
+
+def load_lastrun(tests_root):
+    """
+    Load .micropytest.json from the given tests root (tests_root/.micropytest.json), if present.
+    Returns a dict with test durations, etc.
+    The parsed file is cached as long as it is not modified.
+    """
+    p = _lastrun_path(tests_root)
+    try:
+        key, version = _file_version(p)
+    except OSError:
+        return {}
+    cached = _lastrun_cache.get(key)
+    if cached is not None and cached[0] == version:
+        return _copy_lastrun(cached[1])
+    try:
+        data = _decode_lastrun(p.read_bytes())
+    except Exception:
+        return {}
+    if not isinstance(data, dict):
+        return {}
+    _lastrun_cache[key] = (version, data)
+    return _copy_lastrun(data)
+
+
+def store_lastrun(tests_root, test_durations):
+    """
+    Write out test durations to tests_root/.micropytest.json.
+    The file is replaced atomically (so it is never left half-written) and is not written if its content is unchanged.
+    """
+    data = {
+        "_comment": "This file is optional: it stores data about the last run of tests for time estimates.",
+        "micropytest_version": __version__,
+        "test_durations": test_durations
+    }
+    payload = _encode_lastrun(data)
+    p = _lastrun_path(tests_root)
+    try:
+        if p.is_file() and p.read_bytes() == payload:
+            return
+        tmp_path = p.with_name(f"{p.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        try:
+            with tmp_path.open("wb") as f:
+                f.write(payload)
+            os.replace(tmp_path, p)
+        except BaseException:
+            tmp_path.unlink(missing_ok=True)
+            raise
+        key, version = _file_version(p)
+        _lastrun_cache[key] = (version, _copy_lastrun(data))
+    except Exception:
+        pass
+
+
+def _encode_lastrun(data: dict) -> bytes:
+    """Encode last run data as indented UTF-8 JSON (using orjson if it is installed, with the same layout)."""
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2)
+    return json.dumps(data, indent=2, ensure_ascii=False).encode("utf-8")
+
+
+def _decode_lastrun(payload: bytes) -> Any:
+    if orjson is not None:
+        return orjson.loads(payload)
+    return json.loads(payload.decode("utf-8"))
+
+
+def _copy_lastrun(data: dict) -> dict:
+    """Copy last run data so that callers can modify the test durations without affecting the cache."""
+    data = dict(data)
+    if isinstance(data.get("test_durations"), dict):
+        data["test_durations"] = dict(data["test_durations"])
+    return data
+
+
+def _lastrun_path(tests_root) -> Path:
+    """Path of .micropytest.json for the given tests root (directory of the file if a single test file is given)."""
+    p = Path(tests_root)
+    if p.is_file():
+        p = p.parent
+    return p / CONFIG_FILE
+
+
+def _has_parameters(fn) -> bool:
+    """Check if a function accepts any parameters (cached, since inspect.signature is slow)."""
+    try:
+        has_parameters = _has_parameters_cache.get(fn)
+    except TypeError:  # not weakly referenceable (e.g. a builtin), so it can't be cached
+        return len(inspect.signature(fn).parameters) > 0
+    if has_parameters is None:
+        has_parameters = len(inspect.signature(fn).parameters) > 0
+        _has_parameters_cache[fn] = has_parameters
+    return has_parameters
+
+
+def run_test_function(fn, ctx, args: Args):
+    if inspect.iscoroutinefunction(fn):
+        import asyncio  # imported lazily, as it is slow to import and only needed for async tests
+        if not _has_parameters(fn):
+            r = asyncio.run(fn(*args.args, **args.kwargs))
+        else:
+            r = asyncio.run(fn(ctx, *args.args, **args.kwargs))
+    else:
+        if not _has_parameters(fn):
+            r = fn(*args.args, **args.kwargs)
+        else:
+            r = fn(ctx, *args.args, **args.kwargs)
+    return r
+
+
+def run_tests(
+    tests_path,
+    show_estimates=False,
+    context_class=TestContext,
+    context_kwargs={},
+    test_filter=None,
+    tag_filter=None,
+    exclude_tags=None,
+    show_progress=True,
+    dry_run=False,
+    parallel=1,
+    parallel_tag=PARALLEL_SAFE_TAG,
+    fail_fast=False,
+) -> list[TestResult]:
+    """
+    Discover tests and run them.
+
+    The core function that:
+      1) Discovers test_*.py
+      2) For each test function test_*,
+         - optionally injects a TestContext (or a user-provided subclass)
+         - times the test
+         - logs pass/fail/skip
+      3) Updates .micropytest.json with durations
+      4) Returns a list of test results
+
+    :param tests_path: (str) Where to discover tests (a directory or a single test file)
+    :param show_estimates: (bool) Whether to show time estimates
+    :param context_class: (type) A class to instantiate as the test context
+    :param context_kwargs: (dict) Keyword arguments to pass to the context class
+    :param test_filter: (str) Optional filter to run only tests matching this pattern
+    :param tag_filter: (str or list) Optional tag(s) to filter tests by
+    :param exclude_tags: (str or list) Optional tag(s) to exclude tests by
+    :param show_progress: (bool) Whether to show a progress bar during test execution
+    :param parallel: (int) Number of threads for importing test files and for running tests tagged with
+        parallel_tag concurrently
+    :param parallel_tag: (str or None) Tag of the tests that may run concurrently, None to run all tests concurrently
+    :param fail_fast: (bool) Whether to stop running further tests after the first failure
+    """
+    discover_ctx = context_class(**context_kwargs)
+    tests = discover_tests(discover_ctx, tests_path, test_filter, tag_filter, exclude_tags, import_workers=parallel)
+    test_results = run_discovered_tests(
+        tests_path, tests, show_estimates, show_progress, context_class, context_kwargs, dry_run, parallel, parallel_tag,
+        fail_fast,
+    )
+    return test_results
+
+
+def get_logger():
+    root_logger = logging.getLogger()
+    root_logger.setLevel(logging.DEBUG)
+    return root_logger
+
+
+def run_discovered_tests(
+    tests_path,
+    tests: list[Test],
+    show_estimates=False,
+    show_progress=True,
+    context_class=TestContext,
+    context_kwargs={},
+    dry_run=False,
+    parallel=1,
+    parallel_tag=PARALLEL_SAFE_TAG,
+    fail_fast=False,
+) -> list[TestResult]:
+    """Run the given set of tests that were discovered in a previous step.
+
+    If parallel > 1, tests tagged with parallel_tag (all tests if parallel_tag is None) are run concurrently in that
+    many threads, before the other tests, which are still run one by one. Each concurrent test has its own context
+    and only captures the logs of its own thread. Results are returned in the order of the given tests.
+
+    If fail_fast is True, no further tests are started after the first failure (tests that are already running
+    concurrently are completed), only the results of the tests that were run are returned.
+
+    Known durations from the last run are used to start the longest concurrent tests first and, with fail_fast, to
+    run the shortest tests first.
+    """
+
+    # Logger
+    root_logger = get_logger()
+
+    # Load known durations
+    test_durations = load_lastrun(tests_path).get("test_durations", {})
+
+    total_tests = len(tests)
+    results: list[Optional[TestResult]] = [None] * total_tests
+
+    # Possibly show total estimate
+    _show_total_estimate(show_estimates, total_tests, tests, test_durations, root_logger)
+
+    # Initialize counters for statistics
+    counts = TestStats()
+
+    def run_one(test: Test, concurrent: bool) -> TestResult:
+        # Create a context of the user-specified type
+        ctx = context_class(**context_kwargs)
+
+        # attach a log handler for this test
+        thread_id = threading.get_ident() if concurrent else None
+        test_handler = GlobalContextLogHandler(ctx, formatter=SimpleLogFormatter(use_colors=False), thread_id=thread_id)
+        root_logger.addHandler(test_handler)
+        try:
+            _show_estimate(show_estimates, test_durations, test.key, root_logger)
+            return run_test_collect_result(test, ctx, root_logger, dry_run)
+        finally:
+            root_logger.removeHandler(test_handler)
+            _flush_log_handlers(root_logger)
+
+    def record(index: int, result: TestResult):
+        test = tests[index]
+        counts.update(result)
+        test_durations[test.key] = result.duration_s
+        results[index] = result
+
+        # Add tags to the log output if present
+        if test.tags:
+            tag_str = ", ".join(sorted(test.tags))
+            root_logger.info("Tags: %s", tag_str)
+
+        # Update progress bar with new statistics
+        progress.update(counts)
+
+    if parallel > 1:
+        concurrent_indices = [i for i, test in enumerate(tests) if parallel_tag is None or parallel_tag in test.tags]
+    else:
+        concurrent_indices = []
+    concurrent_set = set(concurrent_indices)
+    serial_indices = [i for i in range(total_tests) if i not in concurrent_set]
+
+    # Order by known durations: start the longest tests first when running concurrently (shortest overall time), and
+    # run the shortest tests first with fail_fast (to find failures early). Results keep the order of the given tests.
+    concurrent_indices.sort(key=lambda i: -test_durations.get(tests[i].key, 0.0))
+    if fail_fast:
+        serial_indices.sort(key=lambda i: test_durations.get(tests[i].key, 0.0))
+
+    with TestProgress(show_progress, total_tests) as progress:
+        # Run tests concurrently (progress is only updated from this thread)
+        if len(concurrent_indices) > 0:
+            executor = ThreadPoolExecutor(max_workers=parallel)
+            futures = {}
+            try:
+                futures = {executor.submit(run_one, tests[i], True): i for i in concurrent_indices}
+                for future in as_completed(futures):
+                    record(futures[future], future.result())
+                    if fail_fast and counts.failed > 0:
+                        break
+            finally:
+                # tests that were not started yet are cancelled
+                executor.shutdown(wait=True, cancel_futures=True)
+                for future, i in futures.items():
+                    if results[i] is None and future.done() and not future.cancelled():
+                        record(i, future.result())
+
+        # Run remaining tests one by one
+        for i in serial_indices:
+            if fail_fast and counts.failed > 0:
+                root_logger.info("Stopping after the first failure (fail fast)")
+                break
+            record(i, run_one(tests[i], False))
+
+    test_results = [result for result in results if result is not None]
+
+    # Print final summary
+    root_logger.info("Tests completed: %d/%d passed, %d skipped.", counts.passed, total_tests, counts.skipped)
+
+    # Write updated durations
+    if not dry_run:
+        store_lastrun(tests_path, test_durations)
+    _flush_log_handlers(root_logger)
+    return test_results
+
+
+def run_single_test(test: Test, ctx: TestContext, concurrent=False) -> TestResult:
+    """Run a single test and return its result.
+
+    Set concurrent to True if other tests are run at the same time in other threads. The test's logs then only
+    include records emitted by the calling thread or through ctx.
+    """
+    root_logger = get_logger()
+    thread_id = threading.get_ident() if concurrent else None
+    test_handler = GlobalContextLogHandler(ctx, formatter=SimpleLogFormatter(use_colors=False), thread_id=thread_id)
+    root_logger.addHandler(test_handler)
+    result = run_test_collect_result(test, ctx, root_logger, dry_run=False)
+    root_logger.removeHandler(test_handler)
+    _flush_log_handlers(root_logger)
+    return result
+
+
+def _flush_log_handlers(logger):
+    """Wait until the handlers have written all log records (console logs are written by a background thread)."""
+    for handler in logger.handlers:
+        handler.flush()
+
+
+def run_test_collect_result(test: Test, ctx, logger, dry_run) -> TestResult:
+    """Try to run a single test and return its result."""
+
+    key = test.key
+    start_time = datetime.now(timezone.utc)
+    exception = None
+    return_value = None
+    t0 = time.perf_counter()
+
+    try:
+        if not dry_run:
+            return_value = run_test_function(test.function, ctx, test.args)
+
+        duration = time.perf_counter() - t0
+        status = "pass"
+        duration_str = ''
+        if duration > TIME_REPORT_CUTOFF:
+            duration_str = f" ({duration:.2g} seconds)"
+        logger.info("FINISHED PASS: %s%s", key, duration_str)
+
+    except SkipTest as e:
+        duration = time.perf_counter() - t0
+        status = "skip"
+        exception = e
+        logger.info("SKIPPED: %s (%.3fs) - %s", key, duration, e)
+
+    except Exception as e:
+        duration = time.perf_counter() - t0
+        status = "fail"
+        exception = e
+        # formatting the traceback is expensive, skip it if the record would be discarded anyway
+        if logger.isEnabledFor(logging.ERROR):
+            logger.error("FINISHED FAIL: %s (%.3fs)\n%s", key, duration, format_exception(e))
+
+    try:
+        ctx.finish()
+    except Exception as e:
+        status = "fail"
+        exception = e
+
+    return TestResult(
+        test=test,
+        status=status,
+        logs=ctx.log_records if isinstance(ctx.log_records, list) else list(ctx.log_records),
+        artifacts=ctx.artifacts,
+        exception=exception,
+        return_value=return_value,
+        start_time=start_time,
+        duration_s=duration,
+        dropped_logs=ctx.dropped_log_records,
+    )
+
+
+def _show_total_estimate(show_estimates, total_tests, tests: list[Test], test_durations, logger):
+    if show_estimates and total_tests > 0:
+        sum_known = 0.0
+        for test in tests:
+            sum_known += test_durations.get(test.key, 0.0)
+        if sum_known > 0:
+            logger.info("Estimated total time: ~ %.2g seconds for %d tests", sum_known, total_tests)
+
+
+def _show_estimate(show_estimates, test_durations, key, logger):
+    if show_estimates:
+        est_str = ''
+        known_dur = test_durations.get(key, 0.0)
+        if known_dur > TIME_REPORT_CUTOFF:
+            est_str = f" (estimated ~ {known_dur:.2g} seconds)"
+        logger.info("STARTING: %s%s", key, est_str)
+
+
+def format_exception(exception: Exception) -> str:
+    """Format exception using '{type}: {message}\\n{traceback}'."""
+    tb_str = ''.join(traceback.format_exception(type(exception), exception, exception.__traceback__))
+    return f"{type(exception).__name__}: {exception}\n{tb_str}"
+
+
+def setup_logging(quiet=False, verbose=False):
+    # Create our formatter and handler
+    root_logger = logging.getLogger()
+
+    # If quiet => set level above CRITICAL (so no logs)
+    if quiet:
+        root_logger.setLevel(logging.CRITICAL + 1)
+    else:
+        live_format = SimpleLogFormatter(use_colors=_use_colors(sys.stdout))
+        live_handler = create_live_console_handler(formatter=live_format)
+        level = logging.DEBUG if verbose else logging.INFO
+        root_logger.setLevel(level)
+        live_handler.setLevel(level)
+        root_logger.addHandler(live_handler)
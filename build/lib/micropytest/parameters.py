@@ -0,0 +1,46 @@
+import json
+from .decorators import parameterize
+
+class Args:
+    """A container to store function arguments.
+
+    The string and JSON representations are computed once and cached, the arguments must not be modified afterwards.
+    """
+    __slots__ = ("args", "kwargs", "_str", "_json")
+
+    def __init__(self, *args, **kwargs):
+        self.args = args
+        self.kwargs = kwargs
+        self._str = None
+        self._json = None
+
+    def __str__(self):
+        if self._str is None:
+            args = [repr(arg) for arg in self.args]
+            kwargs = [f"{k}={repr(v)}" for k, v in self.kwargs.items()]
+            self._str = f"({', '.join(args + kwargs)})"
+        return self._str
+
+    def __repr__(self):
+        return f"Args{str(self)}"
+
+    def is_empty(self):
+        return len(self.args) == 0 and len(self.kwargs) == 0
+
+    def to_json(self) -> str:
+        """Canonical JSON serialization."""
+        if self._json is None:
+            d = {'args': list(self.args), 'kwargs': self.kwargs}
+            # sort keys and use most compact representation
+            # note that tuples in data will be converted to lists (irreversibly)
+            self._json = json.dumps(d, sort_keys=True, separators=(',', ':'), ensure_ascii=False)
+        return self._json
+
+    @staticmethod
+    def from_json(s: str) -> "Args":
+        """Create an Args object from canonical JSON serialization."""
+        d = json.loads(s)
+        return Args(*d['args'], **d['kwargs'])
+
+
+__all__ = ["parameterize", "Args"]
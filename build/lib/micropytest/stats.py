@@ -0,0 +1,42 @@
+from dataclasses import dataclass
+from .types import TestResult
+
+
+@dataclass
+class TestStats:
+    passed: int = 0
+    failed: int = 0
+    skipped: int = 0
+    warnings: int = 0
+    errors: int = 0
+    total_time: float = 0.0
+
+    def update(self, result: TestResult):
+        """Update counters based on test result."""
+        status = result.status
+        logs = result.logs
+        if status == "pass":
+            self.passed += 1
+        elif status == "fail":
+            self.failed += 1
+        elif status == "skip":
+            self.skipped += 1
+        # count warnings and errors in a single pass over the logs
+        warnings = errors = 0
+        for record in logs:
+            levelname = record.levelname
+            if levelname == "WARNING":
+                warnings += 1
+            elif levelname == "ERROR" or levelname == "CRITICAL":
+                errors += 1
+        self.warnings += warnings
+        self.errors += errors
+        self.total_time += result.duration_s
+        return self
+
+    @staticmethod
+    def from_results(test_results: list[TestResult]):
+        stats = TestStats()
+        for result in test_results:
+            stats.update(result)
+        return stats
@@ -0,0 +1,109 @@
+"""
+This script should be started as daemon subprocess.
+It sends keep-alive messages to an API endpoint periodically.
+"""
+import sys
+import os
+import threading
+import json
+import requests
+
+ALIVE_INTERVAL = 5  # seconds
+REQUEST_TIMEOUT = 1  # seconds
+HTTP_HEADERS = json.loads(os.environ.get("HTTP_HEADERS", "{}"))
+
+def main():
+    if len(sys.argv) < 2:
+        print("Usage: python daemon.py <api_endpoint>", file=sys.stderr)
+        sys.exit(1)
+    api_endpoint = sys.argv[1]
+    session = requests.Session()
+
+    run_ids: set[int] = set()  # test runs that are currently running
+    lock = threading.Lock()
+    exit_event = threading.Event()
+    parent_pid = os.getppid()
+    print(f"Started keep-alive daemon pid={os.getpid()} parent_pid={parent_pid}", file=sys.stderr)
+
+    def worker():
+        batch_supported = True  # whether the server supports reporting multiple runs in one request
+        while not exit_event.wait(ALIVE_INTERVAL):
+            with lock:
+                rids = sorted(run_ids)
+            cancelled = None
+            if len(rids) > 1 and batch_supported:
+                print(f"Sending keep-alive for runs {rids}", file=sys.stderr)
+                try:
+                    cancelled = send_running_alive_batch(rids, api_endpoint, session)
+                except requests.HTTPError as e:
+                    if e.response is None or e.response.status_code not in (404, 405):
+                        print(f"Batch keep-alive failed: {e}", file=sys.stderr)
+                        continue
+                    print("Server does not support batch keep-alive, falling back to one request per run",
+                          file=sys.stderr)
+                    batch_supported = False
+                except requests.RequestException as e:
+                    # the session reconnects on the next request, try again after the next interval
+                    print(f"Batch keep-alive failed: {e}", file=sys.stderr)
+                    continue
+            if cancelled is None:
+                cancelled = []
+                for rid in rids:
+                    print(f"Sending keep-alive for run {rid}", file=sys.stderr)
+                    try:
+                        if send_running_alive(rid, api_endpoint, session):
+                            cancelled.append(rid)
+                    except requests.RequestException as e:
+                        # the session reconnects on the next request, keep pinging the other runs
+                        print(f"Keep-alive for run {rid} failed: {e}", file=sys.stderr)
+            for rid in cancelled:
+                print(f"Got cancel for run {rid}: sending cancel to parent process via stdout", file=sys.stderr)
+                print(f"cancel {rid}")
+                sys.stdout.flush()
+                with lock:
+                    run_ids.discard(rid)
+
+    thread = threading.Thread(target=worker, daemon=True)
+    thread.start()
+
+    while True:
+        line = sys.stdin.readline()
+        if line == '':
+            # parent exited or closed stdin -> exit
+            exit_event.set()  # request thread to exit
+            break
+        line = line.strip()
+        print(f"Received command: {line}", file=sys.stderr)
+        parts = line.split()
+        with lock:
+            if len(parts) == 2 and parts[0] == "start":
+                run_ids.add(int(parts[1]))
+            elif len(parts) == 2 and parts[0] == "stop":
+                run_ids.discard(int(parts[1]))
+            elif line == "stop":
+                run_ids.clear()
+
+    thread.join()
+    sys.stdout.flush()
+    sys.stdout.close()
+    print("Keep-alive daemon exited normally", file=sys.stderr)
+
+
+def send_running_alive(run_id: int, url: str, session: requests.Session) -> bool:
+    """Report to server that a test is still running, return True if the test was cancelled server side."""
+    url = f"{url}/runs/{run_id}/alive"
+    response = session.put(url, headers=HTTP_HEADERS, timeout=REQUEST_TIMEOUT)
+    response.raise_for_status()
+    return response.json()['cancel']
+
+
+def send_running_alive_batch(run_ids: list[int], url: str, session: requests.Session) -> list[int]:
+    """Report to server that several tests are still running, return the ids of the runs cancelled server side."""
+    url = f"{url}/runs/alive"
+    response = session.put(url, json={"run_ids": run_ids}, headers=HTTP_HEADERS, timeout=REQUEST_TIMEOUT)
+    response.raise_for_status()
+    return response.json()['cancel']
+
+
+if __name__ == "__main__":
+    main()
@@ -1,53 +1,60 @@
 """Run tests using TestStore to save test results on server. This will:
 - Discover tests
 - Enqueue them on server
-- Pick up tests one by one, run them and store results on server
+- Pick up tests one by one, run them and store results on server (set NUM_WORKERS to run several tests in parallel)
 """
 import os
 import time
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterable
 from micropytest.store import TestStore, KeepAlive, TestContextStored
-from micropytest.core import discover_tests, run_single_test, setup_logging
+from micropytest.core import discover_tests_iter, run_single_test, setup_logging
+from micropytest.types import Test, TestResult
 from micropytest.cli import print_report, print_summary
 
 API_URL = os.environ.get("API_URL", "http://localhost:8000/testframework/api")
 TESTS_PATH = os.environ.get("TESTS_PATH", ".")
+COMPRESSION = os.environ.get("COMPRESSION") or None  # "gzip" or "zstd" to compress large requests (if server supports it)
+BINARY_UPLOAD = os.environ.get("BINARY_UPLOAD", "") not in ("", "0")  # upload bytes artifacts raw instead of base64 in JSON
+NUM_WORKERS = int(os.environ.get("NUM_WORKERS", "1"))  # number of tests to run in parallel
+ENQUEUE_BATCH_SIZE = 64
 
 
 def main():
     print("Set up test store...")
-    store = TestStore(url=API_URL)
+    store = TestStore(url=API_URL, compression=COMPRESSION, use_binary_upload=BINARY_UPLOAD)
+    try:
+        run(store)
+    finally:
+        store.close()
+
+
+def run(store: TestStore):
     discover_ctx = TestContextStored(store)
     setup_logging()
 
-    # Discover tests and enqueue them
-    print("Discovering tests...")
-    tests = discover_tests(discover_ctx, TESTS_PATH)
-    print(f"Discovered {len(tests)} tests")
+    # Discover tests and enqueue them (enqueueing already starts while discovery is still running)
+    print("Discovering and enqueueing tests...")
+    t = time.time()
+    tests = enqueue_while_discovering(store, discover_tests_iter(discover_ctx, TESTS_PATH))
     if len(tests) == 0:
         print("No tests to run.")
         return
-    t = time.time()
-    for test in tests:
-        store.enqueue_test(test)
-    print(f"Enqueued {len(tests)} tests in {time.time() - t:.2f} seconds")
+    print(f"Discovered and enqueued {len(tests)} tests in {time.time() - t:.2f} seconds")
     print(f"Job ID: {store.job}")
 
     # Start tests in queue
-    print("Running tests...")
+    print(f"Running tests ({NUM_WORKERS} in parallel)...")
     test_results = []
-    while True:
-        test_run = store.start_test()
-        if test_run is None:
-            break
-        ctx = TestContextStored(store, test_run.run_id)
-        try:
-            with KeepAlive(store, test_run.run_id):
-                print(f"Running test: {test_run.test.short_key_with_args}")
-                result = run_single_test(test_run.test, ctx)
-            store.finish_test(test_run.run_id, result)
-            test_results.append(result)
-        except KeyboardInterrupt:
-            print("test was cancelled by user, continuing with next test")
+    if NUM_WORKERS == 1:
+        test_results = run_queued_tests(store)
+    else:
+        with ThreadPoolExecutor(max_workers=NUM_WORKERS) as executor:
+            futures = [executor.submit(run_queued_tests, store, True) for _ in range(NUM_WORKERS)]
+            for future in futures:
+                test_results.extend(future.result())
     print_report(test_results)
     print_summary(test_results)
     num_not_run = len(tests) - len(test_results)
@@ -55,5 +62,66 @@ def main():
         print(f"=> {num_not_run} tests were not run")
 
 
+def run_queued_tests(store: TestStore, concurrent: bool = False) -> list[TestResult]:
+    """Pick up tests from the queue one by one until it is empty and run them."""
+    test_results = []
+    ctx = TestContextStored(store)  # reused for all tests run by this worker
+    test_run = store.start_test(wait=True)
+    while test_run is not None:
+        ctx.begin(test_run.run_id)
+        try:
+            with KeepAlive(store, test_run.run_id):
+                print(f"Running test: {test_run.test.short_key_with_args}")
+                result = run_single_test(test_run.test, ctx, concurrent=concurrent)
+        except KeyboardInterrupt:
+            print("test was cancelled by user, continuing with next test")
+            test_run = store.start_test(wait=True)
+            continue
+        finally:
+            ctx.end()
+        test_results.append(result)
+        # report the result and get the next test in a single round-trip
+        test_run = store.finish_and_start_test(test_run.run_id, result, wait=True)
+    return test_results
+
+
+def enqueue_while_discovering(store: TestStore, tests: Iterable[Test]) -> list[Test]:
+    """Enqueue tests in batches from a background thread while they are being discovered."""
+    test_queue = queue.Queue()
+    errors = []
+
+    def enqueue_worker():
+        done = False
+        while not done:
+            batch = [test_queue.get()]
+            while len(batch) < ENQUEUE_BATCH_SIZE and batch[-1] is not None:
+                try:
+                    batch.append(test_queue.get_nowait())
+                except queue.Empty:
+                    break
+            if batch[-1] is None:
+                batch.pop()  # end of discovery
+                done = True
+            if len(batch) > 0 and len(errors) == 0:
+                try:
+                    store.enqueue_tests(batch)
+                except Exception as e:
+                    errors.append(e)
+
+    thread = threading.Thread(target=enqueue_worker, daemon=True)
+    thread.start()
+    discovered = []
+    try:
+        for test in tests:
+            discovered.append(test)
+            test_queue.put(test)
+    finally:
+        test_queue.put(None)
+        thread.join()
+    if len(errors) > 0:
+        raise errors[0]
+    return discovered
+
+
 if __name__ == "__main__":
     main()
@@ -1,6 +1,9 @@
 import os
 from micropytest.decorators import tag
 
+THIS_FILE = os.path.abspath(__file__)
+THIS_FILE_NAME = os.path.basename(THIS_FILE)
+
 @tag('artifacts', 'string', 'unit', 'fast')
 def test_artifact_str(ctx):
     ctx.add_artifact("my_string", "hello world")
@@ -18,7 +21,5 @@ def test_artifact_dict(ctx):
 
 @tag('artifacts', 'filesystem', 'unit')
 def test_submit_current_file(ctx):
-    file_path = os.path.abspath(__file__)
-    file_name = os.path.basename(file_path)
-    ctx.add_artifact_file(file_name, file_path)
+    ctx.add_artifact_file(THIS_FILE_NAME, THIS_FILE)
     assert True
@@ -1,4 +1,3 @@
-import time
 import sys
 import os
 from micropytest.command import Command
@@ -85,11 +84,8 @@ def test_interactive_basic(ctx):
         # Send a command to the Python interpreter
         cmd.write("print('Hello from interactive Python')\n")
         
-        # Give it a moment to process
-        time.sleep(0.1)
-        
-        # Check output
-        stdout = cmd.get_stdout()
+        # Wait until the output arrives
+        stdout = cmd.wait_for_output(lambda out: any("Hello from interactive Python" in line for line in out))
         ctx.debug(f"Python output: {stdout}")
         
         # Exit the interpreter
@@ -107,11 +103,8 @@ def test_interactive_with_output_access(ctx):
         # Write a command
         cmd.write("print('Hello, world!')\n")
         
-        # Give it a moment to process
-        time.sleep(0.1)
-        
-        # Check the output so far
-        stdout = cmd.get_stdout()
+        # Wait until the greeting arrives
+        stdout = cmd.wait_for_output(lambda out: any("Hello, world!" in line for line in out))
         ctx.debug(f"Current stdout: {stdout}")
         
         # Continue interaction based on what we've seen
@@ -122,9 +115,8 @@ def test_interactive_with_output_access(ctx):
         cmd.write("result = 2 + 2\n")
         cmd.write("print(f'Result: {result}')\n")
         
-        # Wait a bit and check output again
-        time.sleep(0.1)
-        stdout = cmd.get_stdout()
+        # Wait for the result and check output again
+        stdout = cmd.wait_for_output(lambda out: any("Result: 4" in line for line in out))
         
         # Exit the interpreter
         cmd.write("exit()\n")
@@ -190,24 +182,21 @@ number = input()
 print(f"Your favorite number is {number}")
 """]) as cmd:
         # Wait for the first question
-        time.sleep(0.1)
-        stdout = cmd.get_stdout()
+        stdout = cmd.wait_for_output(lambda out: any("What is your name?" in line for line in out))
         ctx.debug(f"Program asked: {stdout}")
         
         # Answer the first question
         cmd.write("Alice\n")
-        time.sleep(0.1)
         
         # Wait for the second question
-        stdout = cmd.get_stdout()
+        stdout = cmd.wait_for_output(lambda out: any("What is your favorite number?" in line for line in out))
         ctx.debug(f"Program output after first answer: {stdout}")
         
         # Answer the second question
         cmd.write("42\n")
-        time.sleep(0.1)
         
         # Get final output
-        stdout = cmd.get_stdout()
+        stdout = cmd.wait_for_output(lambda out: any("Your favorite number is" in line for line in out))
         ctx.debug(f"Final program output: {stdout}")
     
     # Verify the interaction
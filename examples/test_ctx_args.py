@@ -1,17 +1,23 @@
 import argparse
 from micropytest.decorators import tag
 
+# Parsers are built once at import time and reused by every test invocation
+_PARSER_MAIN = argparse.ArgumentParser(description="Test with ctx.args")
+_PARSER_MAIN.add_argument("--string", "-s", default="default string", help="Input string")
+_PARSER_MAIN.add_argument("--number", "-n", type=int, default=0, help="Input number")
+_PARSER_MAIN.add_argument("--operation", "-o", choices=["upper", "lower", "length", "square"],
+                          default="upper", help="Operation to perform")
+_PARSER_MAIN.add_argument("--verbose", "-v", action="store_true", help="Enable verbose output")
+
+_PARSER_FILE_OPS = argparse.ArgumentParser(description="Test file operations")
+_PARSER_FILE_OPS.add_argument("--filename", help="File to operate on (creates temp file if not provided)")
+_PARSER_FILE_OPS.add_argument("--mode", choices=["read", "write", "append"], default="write",
+                              help="File operation mode")
+_PARSER_FILE_OPS.add_argument("--content", default="Default content", help="Content to write/append")
+
 @tag('args', 'cli', 'unit')
 def test_cmdline_parser(ctx):
-    # Create parser
-    parser = argparse.ArgumentParser(description="Test with ctx.args")
-    parser.add_argument("--string", "-s", default="default string", help="Input string")
-    parser.add_argument("--number", "-n", type=int, default=0, help="Input number")
-    parser.add_argument("--operation", "-o", choices=["upper", "lower", "length", "square"], 
-                        default="upper", help="Operation to perform")
-    parser.add_argument("--verbose", "-v", action="store_true", help="Enable verbose output")
-    
-    args, _ = parser.parse_known_args()
+    args, _ = _PARSER_MAIN.parse_known_args()
     
     # Log the parsed arguments
     ctx.info("==== Parsed arguments:")
@@ -22,15 +28,7 @@ def test_cmdline_parser(ctx):
 @tag('args', 'cli', 'unit')
 def test_with_ctx_args(ctx):
     """Test that uses ctx.args with standard argparse."""
-    # Create parser
-    parser = argparse.ArgumentParser(description="Test with ctx.args")
-    parser.add_argument("--string", "-s", default="default string", help="Input string")
-    parser.add_argument("--number", "-n", type=int, default=0, help="Input number")
-    parser.add_argument("--operation", "-o", choices=["upper", "lower", "length", "square"], 
-                        default="upper", help="Operation to perform")
-    parser.add_argument("--verbose", "-v", action="store_true", help="Enable verbose output")
-    
-    args, _ = parser.parse_known_args()
+    args, _ = _PARSER_MAIN.parse_known_args()
     
     # Log the parsed arguments
     ctx.debug("Parsed arguments:")
@@ -66,63 +64,50 @@ def test_file_operations(ctx):
     import os
     import tempfile
     
-    # Create parser
-    parser = argparse.ArgumentParser(description="Test file operations")
-    parser.add_argument("--filename", help="File to operate on (creates temp file if not provided)")
-    parser.add_argument("--mode", choices=["read", "write", "append"], default="write",
-                        help="File operation mode")
-    parser.add_argument("--content", default="Default content", help="Content to write/append")
-    
     # Get args from context, defaulting to empty list if not present
     cli_args = getattr(ctx, 'args', [])
     
     # Parse arguments
-    args = parser.parse_args(cli_args)
+    args = _PARSER_FILE_OPS.parse_args(cli_args)
     
     # Log the parsed arguments
     ctx.debug("File operation with arguments:")
     for key, value in vars(args).items():
         ctx.debug(f"  {key}: {value}")
     
-    # Use provided filename or create a temporary one
-    filename = args.filename
-    
-    # Create a temporary file if no filename provided
-    if not filename:
-        with tempfile.NamedTemporaryFile(delete=False) as temp:
-            filename = temp.name
-            temp.write(b'Initial content\n')
-        ctx.debug(f"Created temporary file: {filename}")
-    
-    try:
-        if args.mode == "write":
-            with open(filename, "w") as f:
-                f.write(args.content)
-            result = f"Wrote {len(args.content)} characters"
-        
-        elif args.mode == "append":
-            with open(filename, "a") as f:
-                f.write(args.content)
-            result = f"Appended {len(args.content)} characters"
-        
-        elif args.mode == "read":
-            if os.path.exists(filename):
-                with open(filename, "r") as f:
-                    content = f.read()
-                result = content
-            else:
-                ctx.warn(f"File not found: {filename}")
-                result = "File not found"
-    
-    except Exception as e:
-        ctx.error(f"File operation failed: {str(e)}")
-        raise
-    
-    finally:
-        # Clean up temporary file if we created one
-        if not args.filename and os.path.exists(filename):
-            os.unlink(filename)
-            ctx.debug(f"Deleted temporary file: {filename}")
+    # The temporary directory (and any file we create in it) is removed when the block exits, even on failure
+    with tempfile.TemporaryDirectory() as temp_dir:
+        # Use provided filename or create a temporary one
+        filename = args.filename
+        if not filename:
+            filename = os.path.join(temp_dir, "test_file.txt")
+            with open(filename, "wb") as f:
+                f.write(b'Initial content\n')
+            ctx.debug(f"Created temporary file: {filename}")
+
+        try:
+            if args.mode == "write":
+                with open(filename, "w") as f:
+                    f.write(args.content)
+                result = f"Wrote {len(args.content)} characters"
+
+            elif args.mode == "append":
+                with open(filename, "a") as f:
+                    f.write(args.content)
+                result = f"Appended {len(args.content)} characters"
+
+            elif args.mode == "read":
+                if os.path.exists(filename):
+                    with open(filename, "r") as f:
+                        content = f.read()
+                    result = content
+                else:
+                    ctx.warn(f"File not found: {filename}")
+                    result = "File not found"
+
+        except Exception as e:
+            ctx.error(f"File operation failed: {str(e)}")
+            raise
     
     # Add artifacts
     ctx.add_artifact("filename", filename)
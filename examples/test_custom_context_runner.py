@@ -90,17 +90,22 @@ def test_custom_context_integration():
     # Provide a 'fake_db_conn' if you want to demonstrate usage.
     fake_db_conn = object()  # or your real DB connection
 
-    # We'll run the tests in the current directory with a custom context and DB connection.
-    results = micropytest.core.run_tests(
-        tests_path=".",  # or "example_tests", etc.
-        show_estimates=True,
-        context_class=MyCustomContext,
-        show_progress=False,  # required for nested run to not conflict with progress bar of parent run
-        context_kwargs={
-            "custom_label": "(nested)",
-            "db_conn": fake_db_conn,
-        }
-    )
+    # We'll run test_db_usage in the current directory with a custom context and DB connection. The test filter keeps
+    # the nested run from running the whole suite again (discovery is cached, so this is cheap).
+    try:
+        results = micropytest.core.run_tests(
+            tests_path=".",  # or "example_tests", etc.
+            test_filter="test_db_usage",
+            show_estimates=True,
+            context_class=MyCustomContext,
+            show_progress=False,  # required for nested run to not conflict with progress bar of parent run
+            context_kwargs={
+                "custom_label": "(nested)",
+                "db_conn": fake_db_conn,
+            }
+        )
+    finally:
+        del os.environ["IN_NESTED_RUN"]
     stats = micropytest.core.TestStats.from_results(results)
 
     # Summarize results
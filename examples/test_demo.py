@@ -1,7 +1,7 @@
 import time
 from micropytest.decorators import tag
 
-@tag('unit', 'basic', 'fast')
+@tag('unit', 'basic', 'fast', 'parallel_safe')
 def test_no_ctx():
     """
     A test function that doesn't accept ctx.
@@ -9,11 +9,11 @@ def test_no_ctx():
     # This test is extremely simple: just a raw assertion
     assert 2 + 2 == 4
 
-@tag('performance', 'slow')
+@tag('performance', 'slow', 'parallel_safe')
 def test_long():
     time.sleep(0.5)
 
-@tag('performance', 'slow')
+@tag('performance', 'slow', 'parallel_safe')
 def test_long2():
     time.sleep(1)
 
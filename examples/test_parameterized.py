@@ -1,6 +1,15 @@
 from micropytest.parameters import parameterize, Args
 from micropytest.decorators import tag
 
+# The argument list is static, so it is built once at import time instead of during every discovery
+ARGUMENTS = [
+    Args(1, False),
+    Args(2, False),
+    Args(3, False),
+    Args(42, True),
+    Args(43, False, verbose=True),
+]
+
 def generate_arguments(ctx):
     """Generate a list of arguments (parameter values) for the test."""
     # This is a simple generation, you could also write custom logic depending on the context or the environment.
@@ -11,13 +20,7 @@ def generate_arguments(ctx):
     # You can access ctx.test to get a TestAttributes object (including test name, function, tags, etc.)
     ctx.info(f"generate_arguments: test tags are: {ctx.test.tags}")
     ctx.info(f"generate_arguments: test is: {ctx.test.name}")
-    return [
-        Args(1, False),
-        Args(2, False),
-        Args(3, False),
-        Args(42, True),
-        Args(43, False, verbose=True),
-    ]
+    return list(ARGUMENTS)
 
 
 @tag("weekly", "fast")
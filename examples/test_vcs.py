@@ -2,18 +2,25 @@
 import os
 from shutil import rmtree, copyfile
 import subprocess
+import shlex
 import stat
 from pathlib import Path
-from time import sleep
+from datetime import datetime, timedelta, timezone
 from micropytest.vcs_helper import VCSHelper, VCSError, VCSInfo, VCSHistoryEntry
 from micropytest.decorators import tag
 from dataclasses import asdict
 
+THIS_FILE = os.path.abspath(__file__)
+
+# You could use custom VCS by passing the handlers argument to the constructor to supply a list of
+# VCSInterface implementations
+vcs_helper = VCSHelper()
+
 
 @tag('vcs', 'git', 'integration')
 def test_vcs_helper_git(ctx):
     """Run a test that dumps VCS information about this file."""
-    vcs_helper_function(ctx, __file__)
+    vcs_helper_function(ctx, THIS_FILE)
 
 
 @tag('vcs', 'svn', 'integration')
@@ -31,36 +38,36 @@ def test_vcs_helper_svn(ctx):
 def vcs_helper_function(ctx, file_path):
     # Get the path of the provided file
     current_file = os.path.abspath(file_path)
-
-    # You could use custom VCS by passing the handlers argument to the constructor to supply a list of
-    # VCSInterface implementations
-    vcs_helper = VCSHelper()
+    current_dir = os.path.dirname(current_file)
+    # Read the file once, its lines are used to locate the function and for the line-by-line analysis
+    with open(current_file, 'r') as f:
+        content = f.read()
+    lines = content.splitlines(keepends=True)
 
     ctx.info("VCS Test")
     ctx.info("=============")
     ctx.info(f"Testing file: {current_file}")
 
     # Detect VCS
-    vcs_type = vcs_helper.detect_vcs(os.path.dirname(current_file))
+    vcs = vcs_helper.get_vcs_handler(current_dir)
+    vcs_type = vcs.name if vcs else None
     ctx.info(f"Version Control System: {vcs_type or 'None detected'}")
 
     # Test the VCS detection
-    assert vcs_type is not None, "VCS type should be detected"
-    vcs = vcs_helper.get_vcs_handler(os.path.dirname(current_file))
     assert vcs is not None, "VCS should be detected"
 
     # Get basic repo info
-    repo_root = vcs.get_repo_root(file_path)
+    repo_root = vcs.get_repo_root(current_file)
     ctx.info(f"Repository Root: {repo_root}")
     branch = vcs.get_branch(repo_root)
     ctx.info(f"Branch: {branch}")
     if vcs_type == "git":
-        assert os.path.abspath(repo_root) == os.path.abspath(os.path.dirname(os.path.dirname(file_path))), "Repo path mismatch"
+        assert os.path.abspath(repo_root) == os.path.dirname(current_dir), "Repo path mismatch"
         ci_branch = os.environ.get("GITHUB_REF_NAME")
         if ci_branch:
             assert branch == ci_branch, "Branch mismatch"
     elif vcs_type == "svn":
-        assert os.path.abspath(repo_root) == os.path.abspath(os.path.dirname(file_path)), "Repo path mismatch"
+        assert os.path.abspath(repo_root) == current_dir, "Repo path mismatch"
         assert branch == "trunk", "Branch mismatch"
 
     # Get file creator info
@@ -97,14 +104,8 @@ def vcs_helper_function(ctx, file_path):
     ctx.info("Current Function Information:")
     # Find the approximate line number of this function
     try:
-        with open(current_file, 'r') as f:
-            lines = f.readlines()
-
-        function_line = 0
-        for i, line in enumerate(lines, 1):
-            if "def test_vcs_helper" in line:
-                function_line = i
-                break
+        offset = content.find("def test_vcs_helper")
+        function_line = content.count("\n", 0, offset) + 1 if offset >= 0 else 0
 
         if function_line > 0:
             ctx.info(f"  Function starts at line: {function_line}")
@@ -153,9 +154,6 @@ def vcs_helper_function(ctx, file_path):
 
     # Sample a few lines from the file
     try:
-        with open(current_file, 'r') as f:
-            lines = f.readlines()
-
         # Sample lines at different parts of the file
         sample_lines = [
             1,  # First line
@@ -164,18 +162,23 @@ def vcs_helper_function(ctx, file_path):
             len(lines)  # Last line
         ]
 
+        # Query the authors of all sampled lines at once
+        try:
+            line_authors = vcs.get_line_authors(current_file, sample_lines)
+        except VCSError as e:
+            ctx.error(f"    {e}")
+            line_authors = {}
+
         line_analysis = {}
         for line_num in sample_lines:
             ctx.info(f"\n  Line {line_num}: {lines[line_num-1].strip()}")
 
-            try:
-                line_author = vcs.get_line_author(current_file, line_num)
+            line_author = line_authors.get(line_num)
+            if line_author is not None:
                 assert isinstance(line_author, VCSInfo)
                 ctx.info(f"    Author: {line_author.name}")
                 ctx.info(f"    Last modified: {line_author.date}")
                 line_analysis[str(line_num)] = asdict(line_author)
-            except VCSError as e:
-                ctx.error(f"    {e}")
 
         # Store line analysis as an artifact
         ctx.add_artifact("line_analysis", line_analysis)
@@ -195,6 +198,7 @@ class DummySVNRepo:
         if os.path.exists(self.path):
             raise RuntimeError(f"Path {self.path} already exists")
 
+        start_time = datetime.now(timezone.utc)
         try:
             os.makedirs(self.repo_path, exist_ok=True)
 
@@ -215,32 +219,58 @@ class DummySVNRepo:
             subprocess.check_call(['svn', 'checkout', f'{self.url}/trunk', self.working_copy_path])
 
             # Make some changes and commit them
-            sleep(2)
+            # Each svn call handles all of its paths at once, and the svn calls of a phase are chained in one shell
             with open(os.path.join(self.working_copy_path, 'hello.txt'), 'a') as f:
                 f.write('Hello again!\n')
-            for d in ['subdir', 'subdir2']:
-                os.makedirs(os.path.join(self.working_copy_path, d))
-                subprocess.check_call(['svn', 'add', os.path.join(self.working_copy_path, d)])
-            subprocess.check_call(['svn', 'commit', self.working_copy_path, '-m', 'Second commit'])
-            sleep(2)
+            added = [os.path.join(self.working_copy_path, d) for d in ['subdir', 'subdir2']]
+            for d in added:
+                os.makedirs(d)
+            self._run_commands([
+                ['svn', 'add', *added],
+                ['svn', 'commit', self.working_copy_path, '-m', 'Second commit'],
+            ])
             with open(os.path.join(self.working_copy_path, 'hello.txt'), 'a') as f:
                 f.write('Hello a third time!\n\ndef test_vcs_helper:\n    pass\n')
-            for f in ['hello.txt']:
-                copyfile(os.path.join(self.working_copy_path, f), os.path.join(self.working_copy_path, 'subdir', f))
-                subprocess.check_call(['svn', 'add', os.path.join(self.working_copy_path, 'subdir', f)])
-            for d in ['subdir2']:
-                os.rmdir(os.path.join(self.working_copy_path, d))
-                subprocess.check_call(['svn', 'delete', os.path.join(self.working_copy_path, d)])
-            subprocess.check_call(['svn', 'commit', self.working_copy_path, '-m', 'Third commit'])
-            subprocess.check_call(['svn', 'update', os.path.join(self.working_copy_path, 'subdir')])
-            subprocess.check_call(['svn', 'delete', os.path.join(self.working_copy_path, 'subdir'), '--force'])
-            subprocess.check_call(['svn', 'commit', self.working_copy_path, '-m', 'Fourth commit'])
-            subprocess.check_call(['svn', 'update', self.working_copy_path])
+            added = [os.path.join(self.working_copy_path, 'subdir', f) for f in ['hello.txt']]
+            for f in added:
+                copyfile(os.path.join(self.working_copy_path, os.path.basename(f)), f)
+            deleted = [os.path.join(self.working_copy_path, d) for d in ['subdir2']]
+            for d in deleted:
+                os.rmdir(d)
+            self._run_commands([
+                ['svn', 'add', *added],
+                ['svn', 'delete', *deleted],
+                ['svn', 'commit', self.working_copy_path, '-m', 'Third commit'],
+                ['svn', 'update', os.path.join(self.working_copy_path, 'subdir')],
+                ['svn', 'delete', os.path.join(self.working_copy_path, 'subdir'), '--force'],
+                ['svn', 'commit', self.working_copy_path, '-m', 'Fourth commit'],
+                ['svn', 'update', self.working_copy_path],
+            ])
+
+            # Give the first two commits distinct earlier dates instead of waiting between the commits
+            self._set_revision_date(1, start_time - timedelta(seconds=4))
+            self._set_revision_date(2, start_time - timedelta(seconds=2))
 
         except Exception as e:
             self.cleanup()
             raise RuntimeError(f"Failed to setup dummy SVN repo: {e}")
 
+    @staticmethod
+    def _run_commands(commands):
+        # on POSIX run the commands in a single shell process (stops at the first failing command)
+        if os.name == 'posix':
+            subprocess.run(' && '.join(shlex.join(c) for c in commands), shell=True, check=True)
+        else:
+            for c in commands:
+                subprocess.check_call(c)
+
+    def _set_revision_date(self, revision, date):
+        # svnadmin setrevprop does not need a pre-revprop-change hook (unlike svn propset --revprop)
+        value_file = os.path.join(self.path, 'svn_date.txt')
+        with open(value_file, 'w') as f:
+            f.write(date.strftime('%Y-%m-%dT%H:%M:%S.%fZ'))
+        subprocess.check_call(['svnadmin', 'setrevprop', self.repo_path, '-r', str(revision), 'svn:date', value_file])
+
     def cleanup(self):
         def remove_readonly(func, path, excinfo):
             os.chmod(path, stat.S_IWRITE)  # Attempt to make file writable
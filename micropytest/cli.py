@@ -13,6 +13,7 @@ from .core import (
     run_tests,
     TestStats,
     TIME_REPORT_CUTOFF,
+    PARALLEL_SAFE_TAG,
 )
 from .types import TestResult
 
@@ -38,6 +39,12 @@ def console_main():
                         help='Run a specific test by name')
     parser.add_argument("--dry-run", action="store_true",
                         help='Show what tests would be run without actually running them (assumes they pass)')
+    parser.add_argument("--parallel", "-j", type=int, default=1, metavar="N",
+                        help="Import test files and run tests tagged 'parallel_safe' concurrently in N threads (default: 1)")
+    parser.add_argument("--parallel-all", action="store_true",
+                        help="With --parallel, run all tests concurrently (not only those tagged 'parallel_safe')")
+    parser.add_argument("--fail-fast", "--ff", action="store_true",
+                        help="Stop running further tests after the first failure")
     # Tag filtering
     parser.add_argument('--tag', action='append', dest='tags',
                         help='Run only tests with the specified tag (can be used multiple times)')
@@ -80,6 +87,9 @@ def console_main():
         exclude_tags=args.exclude_tags,
         show_progress=show_progress,
         dry_run=args.dry_run,
+        parallel=args.parallel,
+        parallel_tag=None if args.parallel_all else PARALLEL_SAFE_TAG,
+        fail_fast=args.fail_fast,
     )
 
     # Print report and summary line
@@ -97,7 +107,7 @@ def print_report(test_results: list[TestResult], console=None, quiet=False, verb
     """Print detailed report."""
     if console is None:
         console = Console()
-    formatter = SimpleLogFormatter() if verbose else None
+    formatter = SimpleLogFormatter(use_colors=console.is_terminal) if verbose else None
 
     # If not quiet, we print the fancy ASCII summary and per-test lines
     if not quiet and len(test_results) > 1:
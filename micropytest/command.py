@@ -30,15 +30,23 @@ class Command:
         self._stderr_thread = None
         self.stdout_lines = []
         self.stderr_lines = []
+        self._output_condition = threading.Condition()  # notified whenever a line was read or a stream was closed
+        self._stdout_closed = False
 
     def _read_stream(self, stream, callback, output_list):
         """Read from stream, store lines, and call callback for each line."""
         for line in iter(stream.readline, b''):
             line_str = line.decode('utf-8', errors='replace').rstrip()
-            output_list.append(line_str)
+            with self._output_condition:
+                output_list.append(line_str)
+                self._output_condition.notify_all()
             if callback:
                 callback(line_str)
         stream.close()
+        with self._output_condition:
+            if output_list is self.stdout_lines:
+                self._stdout_closed = True
+            self._output_condition.notify_all()
 
     def run(self, stdout_callback: Optional[Callable[[str], None]] = None, 
             stderr_callback: Optional[Callable[[str], None]] = None):
@@ -51,6 +59,7 @@ class Command:
         """
         self.stdout_lines = []
         self.stderr_lines = []
+        self._stdout_closed = False
 
         self.process = subprocess.Popen(
             self.cmd,
@@ -86,6 +95,26 @@ class Command:
         self.process.stdin.write(data.encode('utf-8'))
         self.process.stdin.flush()
 
+    def wait_for_output(self, predicate: Callable[[List[str]], bool], timeout: float = 5.0) -> List[str]:
+        """Block until predicate(stdout_lines) is true and return a copy of the stdout lines collected so far.
+
+        The predicate is checked whenever a new line is read, so this returns as soon as the expected output
+        is available. Raises TimeoutError if the predicate is not satisfied within timeout seconds and
+        RuntimeError if stdout was closed before the predicate was satisfied.
+        """
+        if not self.process:
+            raise RuntimeError("Process not started")
+        endtime = time.monotonic() + timeout
+        with self._output_condition:
+            while not predicate(self.stdout_lines):
+                if self._stdout_closed:
+                    raise RuntimeError("Process output ended before the expected output was received")
+                remaining = endtime - time.monotonic()
+                if remaining <= 0:
+                    raise TimeoutError(f"Expected output was not received within {timeout} seconds")
+                self._output_condition.wait(remaining)
+            return self.stdout_lines.copy()
+
     def get_stdout(self):
         """Get all stdout lines collected so far."""
         return self.stdout_lines.copy()
@@ -134,11 +163,13 @@ class Command:
             endtime = time.monotonic() + timeout
         else:
             endtime = None
-        while self.process.poll() is None:
-            time.sleep(0.5)
-            if endtime is not None and time.monotonic() > endtime:
-                raise subprocess.TimeoutExpired(self.process.args, timeout)
-        return self.process.returncode
+        while True:
+            try:
+                # a short timeout returns as soon as the process exits while staying responsive to KeyboardInterrupt
+                return self.process.wait(timeout=0.1)
+            except subprocess.TimeoutExpired:
+                if endtime is not None and time.monotonic() > endtime:
+                    raise subprocess.TimeoutExpired(self.process.args, timeout)
 
     def __enter__(self):
         if not self.process:
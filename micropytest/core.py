@@ -1,17 +1,24 @@
-import asyncio
 import logging
 import sys
 import os
 import json
 import traceback
 import inspect
+import threading
 import time
+import weakref
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from fnmatch import fnmatch
 from os import PathLike
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any
+from typing import Any, Iterator, Optional, Union
 import importlib.util
+try:
+    import orjson  # optional, faster reading and writing of .micropytest.json
+except ImportError:
+    orjson = None
 from .parameters import Args
 from .progress import TestProgress
 from .stats import TestStats
@@ -21,6 +28,22 @@ from . import __version__
 
 CONFIG_FILE = ".micropytest.json"
 TIME_REPORT_CUTOFF = 0.01 # dont report timings below this
+SKIPPED_DIRS = {".git", "node_modules"}  # directories that are never searched for tests
+SKIPPED_DIR_PARTS = ("venv", "site-packages", "__pycache__")  # ... and directories with these in their name
+LOG_FLUSH_INTERVAL = 0.2  # seconds between flushes of console logs when stdout is not interactive
+PARALLEL_SAFE_TAG = "parallel_safe"  # tests with this tag may run concurrently with each other (see run_tests)
+
+# absolute test file path -> ((mtime_ns, size), module)
+_test_modules_cache: dict[str, tuple[tuple[int, int], Any]] = {}
+
+# absolute test file path -> (module, [(name, function), ...]), valid while the module is the one in _test_modules_cache
+_test_functions_cache: dict[str, tuple[Any, list[tuple[str, Any]]]] = {}
+
+# function -> whether it accepts any parameters (weak keys, so that functions of reloaded modules can be freed)
+_has_parameters_cache: weakref.WeakKeyDictionary[Any, bool] = weakref.WeakKeyDictionary()
+
+# absolute .micropytest.json path -> ((mtime_ns, size), data)
+_lastrun_cache: dict[str, tuple[tuple[int, int], dict]] = {}
 
 
 class SkipTest(Exception):
@@ -32,10 +55,58 @@ class SkipTest(Exception):
 class LiveFlushingStreamHandler(logging.StreamHandler):
     """
     A stream handler that flushes logs immediately, giving real-time console output.
+
+    If the stream is not interactive (e.g. output is piped to a file in CI), records are flushed by a background
+    thread every flush_interval seconds instead of after every record, which avoids a write per log line.
     """
+    def __init__(self, stream=None, flush_interval=LOG_FLUSH_INTERVAL):
+        super(LiveFlushingStreamHandler, self).__init__(stream)
+        self.flush_interval = flush_interval
+        self._flush_immediately = _is_interactive(self.stream)
+        self._flush_thread = None
+        self._closed = threading.Event()
+
     def emit(self, record):
-        super(LiveFlushingStreamHandler, self).emit(record)
+        if self._flush_immediately:
+            super(LiveFlushingStreamHandler, self).emit(record)  # writes and flushes
+            return
+        # same as StreamHandler.emit, but without flushing
+        try:
+            msg = self.format(record)
+            self.stream.write(msg + self.terminator)
+        except RecursionError:
+            raise
+        except Exception:
+            self.handleError(record)
+            return
+        if self._flush_thread is None:
+            self._flush_thread = threading.Thread(target=self._flush_periodically, daemon=True)
+            self._flush_thread.start()
+
+    def _flush_periodically(self):
+        while not self._closed.wait(self.flush_interval):
+            self.flush()
+
+    def close(self):
+        self._closed.set()
         self.flush()
+        super(LiveFlushingStreamHandler, self).close()
+
+
+def _is_interactive(stream) -> bool:
+    try:
+        return stream.isatty()
+    except Exception:
+        return False
+
+
+def _use_colors(stream) -> bool:
+    """Colorize console logs only on a terminal, unless overridden with the NO_COLOR or FORCE_COLOR env variables."""
+    if os.environ.get("NO_COLOR"):
+        return False
+    if os.environ.get("FORCE_COLOR"):
+        return True
+    return _is_interactive(stream)
 
 
 def create_live_console_handler(formatter=None, level=logging.INFO):
@@ -50,33 +121,51 @@ class TestContext:
     """
     A context object passed to each test if it accepts 'ctx'.
     Allows logging via ctx.debug(), etc., storing artifacts (key-value store), and skipping tests.
+
+    Set max_log_records (e.g. in a subclass) to only keep the most recent log records in memory, which limits the
+    memory used by tests that log heavily. Dropped records are not included in the result and its warning/error counts,
+    their number is available as dropped_log_records (and TestResult.dropped_logs).
     """
+    max_log_records: Optional[int] = None
+
     def __init__(self):
-        self.log_records: list[logging.LogRecord] = []
+        self.log_records: Union[list[logging.LogRecord], deque[logging.LogRecord]] = self._new_log_records()
         self.log = logging.getLogger()
         self.artifacts: dict[str, Any] = {}
+        # mark log records emitted through this context, so they can be attributed to it when running concurrently
+        self._log_extra = {"micropytest_ctx_id": id(self)}
 
     def debug(self, msg):
-        self.log.debug(msg)
+        self.log.debug(msg, extra=self._log_extra)
 
     def info(self, msg):
-        self.log.info(msg)
+        self.log.info(msg, extra=self._log_extra)
 
     def warn(self, msg):
-        self.log.warning(msg)
+        self.log.warning(msg, extra=self._log_extra)
 
     def error(self, msg):
-        self.log.error(msg)
+        self.log.error(msg, extra=self._log_extra)
 
     def fatal(self, msg):
-        self.log.critical(msg)
+        self.log.critical(msg, extra=self._log_extra)
 
     def add_artifact(self, key: str, value: Any):
         self.artifacts[key] = value
 
     def add_log(self, record: logging.LogRecord):
+        if self._log_records_limit is not None and len(self.log_records) == self._log_records_limit:
+            self.dropped_log_records += 1  # the deque drops the oldest record to make room for this one
         self.log_records.append(record)
 
+    def _new_log_records(self):
+        """Create the container for the log records of a test run (a bounded deque if max_log_records is set)."""
+        self.dropped_log_records = 0
+        self._log_records_limit = self.max_log_records
+        if self.max_log_records is None:
+            return []
+        return deque(maxlen=self.max_log_records)
+
     def add_artifact_file(self, key: str, path: PathLike):
         with open(path, "rb") as f:
             self.add_artifact(key, f.read())
@@ -103,14 +192,21 @@ class GlobalContextLogHandler(logging.Handler):
     """
     A handler that captures all logs into a single test's context log_records,
     so we can show them in a final summary or store them.
+
+    If thread_id is given (used when tests run concurrently), only records that were emitted by the given thread
+    or through the context (e.g. from a thread started by the test) are captured.
     """
-    def __init__(self, ctx, formatter=None):
+    def __init__(self, ctx, formatter=None, thread_id=None):
         logging.Handler.__init__(self)
         self.ctx = ctx
+        self.thread_id = thread_id
         if formatter:
             self.setFormatter(formatter)
 
     def emit(self, record):
+        if self.thread_id is not None and record.thread != self.thread_id:
+            if getattr(record, "micropytest_ctx_id", None) != id(self.ctx):
+                return
         self.ctx.add_log(record)
 
 
@@ -122,17 +218,22 @@ class SimpleLogFormatter(logging.Formatter):
     def __init__(self, use_colors=True):
         super().__init__()
         self.use_colors = use_colors
+        self._last_timestamp = (None, "")  # (second, formatted local time), records often share the same second
 
     def format(self, record):
-        try:
-            from colorama import Fore, Style
-            has_colorama = True
-        except ImportError:
-            has_colorama = False
-
-        time = datetime.fromtimestamp(record.created, tz=timezone.utc)
-        time_local = time.astimezone()
-        tstamp = time_local.strftime("%H:%M:%S")
+        has_colorama = False
+        if self.use_colors:
+            try:
+                from colorama import Fore, Style
+                has_colorama = True
+            except ImportError:
+                pass
+
+        second = int(record.created)
+        last_second, tstamp = self._last_timestamp
+        if second != last_second:
+            tstamp = time.strftime("%H:%M:%S", time.localtime(second))
+            self._last_timestamp = (second, tstamp)
         level = record.levelname
         origin = record.name
         message = record.getMessage()
@@ -156,11 +257,54 @@ class SimpleLogFormatter(logging.Formatter):
 def load_test_module_by_path(file_path):
     """
     Dynamically import a Python file as a module, so we can discover test_* functions.
+    The module is cached per process and reused as long as the file is not modified.
     """
+    return _load_test_module(file_path)[1]
+
+
+def _load_test_module(file_path) -> tuple[str, Any]:
+    """Return the cache key (absolute path) and the imported module of a test file (see load_test_module_by_path)."""
+    key, version = _file_version(file_path)
+    cached = _test_modules_cache.get(key)
+    if cached is not None and cached[0] == version:
+        return key, cached[1]
     spec = importlib.util.spec_from_file_location("micropytest_dynamic", file_path)
     module = importlib.util.module_from_spec(spec)
     spec.loader.exec_module(module)
-    return module
+    _test_modules_cache[key] = (version, module)
+    return key, module
+
+
+def _file_version(file_path) -> tuple[str, tuple[int, int]]:
+    """Return the cache key (absolute path) and version (modification time and size) of a file."""
+    stat = os.stat(file_path)
+    return os.path.abspath(file_path), (stat.st_mtime_ns, stat.st_size)
+
+
+def load_test_functions(file_path) -> list[tuple[str, Any]]:
+    """
+    Import a test file and return its (name, function) pairs of test_* functions.
+    Results are cached per process and reused as long as the file is not modified (i.e. the module is not reloaded).
+    """
+    key, mod = _load_test_module(file_path)
+    cached = _test_functions_cache.get(key)
+    if cached is not None and cached[0] is mod:
+        return cached[1]
+    functions = []
+    for attr in dir(mod):
+        if attr.startswith("test_"):
+            fn = getattr(mod, attr)
+            if callable(fn):
+                functions.append((attr, fn))
+    _test_functions_cache[key] = (mod, functions)
+    return functions
+
+
+def clear_discovery_cache():
+    """Forget cached test modules and functions, so that all test files are imported again when needed."""
+    _test_functions_cache.clear()
+    _test_modules_cache.clear()
+    _has_parameters_cache.clear()
 
 
 def find_test_files(start_dir="."):
@@ -172,10 +316,10 @@ def find_test_files(start_dir="."):
     test_files = []
     ignore_patterns = []
     for root, dirs, files in os.walk(start_dir):
-        if (".venv" in root) or ("venv" in root) or ("site-packages" in root) or ("__pycache__" in root):
-            continue
+        # prune skipped directories in place, so that os.walk does not descend into them
+        dirs[:] = [d for d in dirs if not _is_skipped_dir(d)]
         for f in files:
-            if (f.startswith("test_") or f.endswith("_test.py")) and f.endswith(".py"):
+            if _is_test_file_name(f):
                 test_files.append(os.path.join(root, f))
             if f == ".micropytestignore":
                 patterns = read_ignore_patterns(os.path.join(root, f))
@@ -189,6 +333,14 @@ def find_test_files(start_dir="."):
     return test_files_used
 
 
+def _is_skipped_dir(name):
+    return name in SKIPPED_DIRS or any(part in name for part in SKIPPED_DIR_PARTS)
+
+
+def _is_test_file_name(name):
+    return (name.startswith("test_") or name.endswith("_test.py")) and name.endswith(".py")
+
+
 def read_ignore_patterns(file_path):
     with open(os.path.join(file_path), "r") as f:
         lines = []
@@ -199,60 +351,90 @@ def read_ignore_patterns(file_path):
         return lines
 
 
-def discover_tests(discover_ctx, tests_path, test_filter=None, tag_filter=None, exclude_tags=None) -> list[Test]:
+def discover_tests(
+    discover_ctx, tests_path, test_filter=None, tag_filter=None, exclude_tags=None, import_workers=1
+) -> list[Test]:
     """Discover all test functions in the given directory and subdirectories."""
+    return list(discover_tests_iter(discover_ctx, tests_path, test_filter, tag_filter, exclude_tags, import_workers))
+
+
+def discover_tests_iter(
+    discover_ctx, tests_path, test_filter=None, tag_filter=None, exclude_tags=None, import_workers=1
+) -> Iterator[Test]:
+    """Like discover_tests, but yield tests one by one as soon as they are discovered."""
     test_files = find_test_files(tests_path)
-    tests = find_test_functions(discover_ctx, test_files, test_filter, tag_filter, exclude_tags)
-    return tests
+    yield from iter_test_functions(discover_ctx, test_files, test_filter, tag_filter, exclude_tags, import_workers)
 
 
-def find_test_functions(discover_ctx, test_files, test_filter=None, tag_filter=None, exclude_tags=None) -> list[Test]:
+def find_test_functions(
+    discover_ctx, test_files, test_filter=None, tag_filter=None, exclude_tags=None, import_workers=1
+) -> list[Test]:
     """Find all test functions in the given test files."""
+    return list(iter_test_functions(discover_ctx, test_files, test_filter, tag_filter, exclude_tags, import_workers))
+
+
+def iter_test_functions(
+    discover_ctx, test_files, test_filter=None, tag_filter=None, exclude_tags=None, import_workers=1
+) -> Iterator[Test]:
+    """Find all test functions in the given test files, yielding them one by one.
+
+    If import_workers > 1, the test files are imported concurrently in that many threads (tests are still yielded
+    in the order of the files). Only use this if the test files can be imported outside the main thread.
+    """
 
     tag_set = tags_to_set(tag_filter)
     exclude_tag_set = tags_to_set(exclude_tags)
 
-    tests = []
-    for f in test_files:
+    executor = None
+    if import_workers > 1 and len(test_files) > 1:
+        executor = ThreadPoolExecutor(max_workers=import_workers)
+        futures = [executor.submit(load_test_functions, f) for f in test_files]
+        loaded_functions = (future.result() for future in futures)
+    else:
+        loaded_functions = (load_test_functions(f) for f in test_files)
+
+    try:
+        yield from _iter_matching_tests(discover_ctx, test_files, loaded_functions, test_filter, tag_set, exclude_tag_set)
+    finally:
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+
+def _iter_matching_tests(discover_ctx, test_files, loaded_functions, test_filter, tag_set, exclude_tag_set):
+    for f, functions in zip(test_files, loaded_functions):
         # Note: errors that happen during the test discovery phase (e.g. import errors) cannot be suppressed
         # because those errors would not be attributed to a specific test. This would mean that some tests would be
         # unexpectedly skipped in case of programming errors, without any indication of what went wrong.
-        mod = load_test_module_by_path(f)
-
-        for attr in dir(mod):
-            if attr.startswith("test_"):
-                fn = getattr(mod, attr)
-                if callable(fn):
-                    # Get tags from the function if they exist
-                    tags = getattr(fn, '_tags', set())
-
-                    # Apply test filter if provided
-                    name_match = not test_filter or test_filter in attr
-
-                    # Apply tag filter if provided
-                    tag_match = not tag_set or (tags and tag_set.intersection(tags))
-
-                    # Apply exclude tag filter if provided
-                    exclude_match = exclude_tag_set and tags and exclude_tag_set.intersection(tags)
-
-                    if name_match and tag_match and not exclude_match:
-                        if hasattr(fn, '_argument_generator'):
-                            if len(inspect.signature(fn._argument_generator).parameters) == 0:
-                                args_list = fn._argument_generator()
-                            else:
-                                discover_ctx.test = TestAttributes(file=f, name=attr, function=fn, tags=tags)
-                                args_list = fn._argument_generator(discover_ctx)
-                            if len(args_list) == 0:
-                                pass  # ignore this test because no arguments were generated
-                            else:
-                                for args in args_list:
-                                    if not isinstance(args, Args):
-                                        f = fn.__name__
-                                        raise ValueError(f"Argument generator of '{f}' returned a non-Args object")
-                                    tests.append(Test(file=f, name=attr, function=fn, tags=tags, args=args))
-                        else:
-                            tests.append(Test(file=f, name=attr, function=fn, tags=tags, args=Args()))
-    return tests
+        for attr, fn in functions:
+            # Get tags from the function if they exist
+            tags = getattr(fn, '_tags', set())
+
+            # Apply test filter if provided
+            name_match = not test_filter or test_filter in attr
+
+            # Apply tag filter if provided
+            tag_match = not tag_set or (tags and tag_set.intersection(tags))
+
+            # Apply exclude tag filter if provided
+            exclude_match = exclude_tag_set and tags and exclude_tag_set.intersection(tags)
+
+            if name_match and tag_match and not exclude_match:
+                if hasattr(fn, '_argument_generator'):
+                    if not _has_parameters(fn._argument_generator):
+                        args_list = fn._argument_generator()
+                    else:
+                        discover_ctx.test = TestAttributes(file=f, name=attr, function=fn, tags=tags)
+                        args_list = fn._argument_generator(discover_ctx)
+                    if len(args_list) == 0:
+                        pass  # ignore this test because no arguments were generated
+                    else:
+                        for args in args_list:
+                            if not isinstance(args, Args):
+                                f = fn.__name__
+                                raise ValueError(f"Argument generator of '{f}' returned a non-Args object")
+                            yield Test(file=f, name=attr, function=fn, tags=tags, args=args)
+                else:
+                    yield Test(file=f, name=attr, function=fn, tags=tags, args=Args())
 
 
 def tags_to_set(list_or_str):
@@ -266,42 +448,102 @@ def load_lastrun(tests_root):
     """
     Load .micropytest.json from the given tests root (tests_root/.micropytest.json), if present.
     Returns a dict with test durations, etc.
+    The parsed file is cached as long as it is not modified.
     """
-    p = Path(tests_root) / CONFIG_FILE
-    if p.exists():
-        try:
-            with p.open("r", encoding="utf-8") as f:
-                return json.load(f)
-        except Exception:
-            pass
-    return {}
+    p = _lastrun_path(tests_root)
+    try:
+        key, version = _file_version(p)
+    except OSError:
+        return {}
+    cached = _lastrun_cache.get(key)
+    if cached is not None and cached[0] == version:
+        return _copy_lastrun(cached[1])
+    try:
+        data = _decode_lastrun(p.read_bytes())
+    except Exception:
+        return {}
+    if not isinstance(data, dict):
+        return {}
+    _lastrun_cache[key] = (version, data)
+    return _copy_lastrun(data)
 
 
 def store_lastrun(tests_root, test_durations):
     """
     Write out test durations to tests_root/.micropytest.json.
+    The file is replaced atomically (so it is never left half-written) and is not written if its content is unchanged.
     """
     data = {
         "_comment": "This file is optional: it stores data about the last run of tests for time estimates.",
         "micropytest_version": __version__,
         "test_durations": test_durations
     }
-    p = Path(tests_root) / CONFIG_FILE
+    payload = _encode_lastrun(data)
+    p = _lastrun_path(tests_root)
     try:
-        with p.open("w", encoding="utf-8") as f:
-            json.dump(data, f, indent=2)
+        if p.is_file() and p.read_bytes() == payload:
+            return
+        tmp_path = p.with_name(f"{p.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        try:
+            with tmp_path.open("wb") as f:
+                f.write(payload)
+            os.replace(tmp_path, p)
+        except BaseException:
+            tmp_path.unlink(missing_ok=True)
+            raise
+        key, version = _file_version(p)
+        _lastrun_cache[key] = (version, _copy_lastrun(data))
     except Exception:
         pass
 
 
+def _encode_lastrun(data: dict) -> bytes:
+    """Encode last run data as indented UTF-8 JSON (using orjson if it is installed, with the same layout)."""
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2)
+    return json.dumps(data, indent=2, ensure_ascii=False).encode("utf-8")
+
+
+def _decode_lastrun(payload: bytes) -> Any:
+    if orjson is not None:
+        return orjson.loads(payload)
+    return json.loads(payload.decode("utf-8"))
+
+
+def _copy_lastrun(data: dict) -> dict:
+    """Copy last run data so that callers can modify the test durations without affecting the cache."""
+    data = dict(data)
+    if isinstance(data.get("test_durations"), dict):
+        data["test_durations"] = dict(data["test_durations"])
+    return data
+
+
+def _lastrun_path(tests_root) -> Path:
+    """Path of .micropytest.json for the given tests root."""
+    return Path(tests_root) / CONFIG_FILE
+
+
+def _has_parameters(fn) -> bool:
+    """Check if a function accepts any parameters (cached, since inspect.signature is slow)."""
+    try:
+        has_parameters = _has_parameters_cache.get(fn)
+    except TypeError:  # not weakly referenceable (e.g. a builtin), so it can't be cached
+        return len(inspect.signature(fn).parameters) > 0
+    if has_parameters is None:
+        has_parameters = len(inspect.signature(fn).parameters) > 0
+        _has_parameters_cache[fn] = has_parameters
+    return has_parameters
+
+
 def run_test_function(fn, ctx, args: Args):
     if inspect.iscoroutinefunction(fn):
-        if len(inspect.signature(fn).parameters) == 0:
+        import asyncio  # imported lazily, as it is slow to import and only needed for async tests
+        if not _has_parameters(fn):
             r = asyncio.run(fn(*args.args, **args.kwargs))
         else:
             r = asyncio.run(fn(ctx, *args.args, **args.kwargs))
     else:
-        if len(inspect.signature(fn).parameters) == 0:
+        if not _has_parameters(fn):
             r = fn(*args.args, **args.kwargs)
         else:
             r = fn(ctx, *args.args, **args.kwargs)
@@ -318,6 +560,9 @@ def run_tests(
     exclude_tags=None,
     show_progress=True,
     dry_run=False,
+    parallel=1,
+    parallel_tag=PARALLEL_SAFE_TAG,
+    fail_fast=False,
 ) -> list[TestResult]:
     """
     Discover tests and run them.
@@ -339,11 +584,16 @@ def run_tests(
     :param tag_filter: (str or list) Optional tag(s) to filter tests by
     :param exclude_tags: (str or list) Optional tag(s) to exclude tests by
     :param show_progress: (bool) Whether to show a progress bar during test execution
+    :param parallel: (int) Number of threads for importing test files and for running tests tagged with
+        parallel_tag concurrently
+    :param parallel_tag: (str or None) Tag of the tests that may run concurrently, None to run all tests concurrently
+    :param fail_fast: (bool) Whether to stop running further tests after the first failure
     """
     discover_ctx = context_class(**context_kwargs)
-    tests = discover_tests(discover_ctx, tests_path, test_filter, tag_filter, exclude_tags)
+    tests = discover_tests(discover_ctx, tests_path, test_filter, tag_filter, exclude_tags, import_workers=parallel)
     test_results = run_discovered_tests(
-        tests_path, tests, show_estimates, show_progress, context_class, context_kwargs, dry_run
+        tests_path, tests, show_estimates, show_progress, context_class, context_kwargs, dry_run, parallel, parallel_tag,
+        fail_fast,
     )
     return test_results
 
@@ -362,8 +612,22 @@ def run_discovered_tests(
     context_class=TestContext,
     context_kwargs={},
     dry_run=False,
+    parallel=1,
+    parallel_tag=PARALLEL_SAFE_TAG,
+    fail_fast=False,
 ) -> list[TestResult]:
-    """Run the given set of tests that were discovered in a previous step."""
+    """Run the given set of tests that were discovered in a previous step.
+
+    If parallel > 1, tests tagged with parallel_tag (all tests if parallel_tag is None) are run concurrently in that
+    many threads, before the other tests, which are still run one by one. Each concurrent test has its own context
+    and only captures the logs of its own thread. Results are returned in the order of the given tests.
+
+    If fail_fast is True, no further tests are started after the first failure (tests that are already running
+    concurrently are completed), only the results of the tests that were run are returned.
+
+    Known durations from the last run are used to start the longest concurrent tests first and, with fail_fast, to
+    run the shortest tests first.
+    """
 
     # Logger
     root_logger = get_logger()
@@ -372,7 +636,7 @@ def run_discovered_tests(
     test_durations = load_lastrun(tests_path).get("test_durations", {})
 
     total_tests = len(tests)
-    test_results = []
+    results: list[Optional[TestResult]] = [None] * total_tests
 
     # Possibly show total estimate
     _show_total_estimate(show_estimates, total_tests, tests, test_durations, root_logger)
@@ -380,35 +644,76 @@ def run_discovered_tests(
     # Initialize counters for statistics
     counts = TestStats()
 
-    with TestProgress(show_progress, total_tests) as progress:
-        # Run tests with progress updates
-        for test in tests:
-            # Create a context of the user-specified type
-            ctx = context_class(**context_kwargs)
-
-            # attach a log handler for this test
-            test_handler = GlobalContextLogHandler(ctx, formatter=SimpleLogFormatter(use_colors=False))
-            root_logger.addHandler(test_handler)
+    def run_one(test: Test, concurrent: bool) -> TestResult:
+        # Create a context of the user-specified type
+        ctx = context_class(**context_kwargs)
 
+        # attach a log handler for this test
+        thread_id = threading.get_ident() if concurrent else None
+        test_handler = GlobalContextLogHandler(ctx, formatter=SimpleLogFormatter(use_colors=False), thread_id=thread_id)
+        root_logger.addHandler(test_handler)
+        try:
             _show_estimate(show_estimates, test_durations, test.key, root_logger)
+            return run_test_collect_result(test, ctx, root_logger, dry_run)
+        finally:
+            root_logger.removeHandler(test_handler)
 
-            result = run_test_collect_result(test, ctx, root_logger, dry_run)
-            counts.update(result)
+    def record(index: int, result: TestResult):
+        test = tests[index]
+        counts.update(result)
+        test_durations[test.key] = result.duration_s
+        results[index] = result
 
-            test_durations[test.key] = result.duration_s
-            test_results.append(result)
-            root_logger.removeHandler(test_handler)
+        # Add tags to the log output if present
+        if test.tags:
+            tag_str = ", ".join(sorted(test.tags))
+            root_logger.info("Tags: %s", tag_str)
 
-            # Add tags to the log output if present
-            if test.tags:
-                tag_str = ", ".join(sorted(test.tags))
-                root_logger.info(f"Tags: {tag_str}")
+        # Update progress bar with new statistics
+        progress.update(counts)
+
+    if parallel > 1:
+        concurrent_indices = [i for i, test in enumerate(tests) if parallel_tag is None or parallel_tag in test.tags]
+    else:
+        concurrent_indices = []
+    concurrent_set = set(concurrent_indices)
+    serial_indices = [i for i in range(total_tests) if i not in concurrent_set]
 
-            # Update progress bar with new statistics
-            progress.update(counts)
+    # Order by known durations: start the longest tests first when running concurrently (shortest overall time), and
+    # run the shortest tests first with fail_fast (to find failures early). Results keep the order of the given tests.
+    concurrent_indices.sort(key=lambda i: -test_durations.get(tests[i].key, 0.0))
+    if fail_fast:
+        serial_indices.sort(key=lambda i: test_durations.get(tests[i].key, 0.0))
+
+    with TestProgress(show_progress, total_tests) as progress:
+        # Run tests concurrently (progress is only updated from this thread)
+        if len(concurrent_indices) > 0:
+            executor = ThreadPoolExecutor(max_workers=parallel)
+            futures = {}
+            try:
+                futures = {executor.submit(run_one, tests[i], True): i for i in concurrent_indices}
+                for future in as_completed(futures):
+                    record(futures[future], future.result())
+                    if fail_fast and counts.failed > 0:
+                        break
+            finally:
+                # tests that were not started yet are cancelled
+                executor.shutdown(wait=True, cancel_futures=True)
+                for future, i in futures.items():
+                    if results[i] is None and future.done() and not future.cancelled():
+                        record(i, future.result())
+
+        # Run remaining tests one by one
+        for i in serial_indices:
+            if fail_fast and counts.failed > 0:
+                root_logger.info("Stopping after the first failure (fail fast)")
+                break
+            record(i, run_one(tests[i], False))
+
+    test_results = [result for result in results if result is not None]
 
     # Print final summary
-    root_logger.info(f"Tests completed: {counts.passed}/{total_tests} passed, {counts.skipped} skipped.")
+    root_logger.info("Tests completed: %d/%d passed, %d skipped.", counts.passed, total_tests, counts.skipped)
 
     # Write updated durations
     if not dry_run:
@@ -416,10 +721,15 @@ def run_discovered_tests(
     return test_results
 
 
-def run_single_test(test: Test, ctx: TestContext) -> TestResult:
-    """Run a single test and return its result."""
+def run_single_test(test: Test, ctx: TestContext, concurrent=False) -> TestResult:
+    """Run a single test and return its result.
+
+    Set concurrent to True if other tests are run at the same time in other threads. The test's logs then only
+    include records emitted by the calling thread or through ctx.
+    """
     root_logger = get_logger()
-    test_handler = GlobalContextLogHandler(ctx, formatter=SimpleLogFormatter(use_colors=False))
+    thread_id = threading.get_ident() if concurrent else None
+    test_handler = GlobalContextLogHandler(ctx, formatter=SimpleLogFormatter(use_colors=False), thread_id=thread_id)
     root_logger.addHandler(test_handler)
     result = run_test_collect_result(test, ctx, root_logger, dry_run=False)
     root_logger.removeHandler(test_handler)
@@ -444,19 +754,21 @@ def run_test_collect_result(test: Test, ctx, logger, dry_run) -> TestResult:
         duration_str = ''
         if duration > TIME_REPORT_CUTOFF:
             duration_str = f" ({duration:.2g} seconds)"
-        logger.info(f"FINISHED PASS: {key}{duration_str}")
+        logger.info("FINISHED PASS: %s%s", key, duration_str)
 
     except SkipTest as e:
         duration = time.perf_counter() - t0
         status = "skip"
         exception = e
-        logger.info(f"SKIPPED: {key} ({duration:.3f}s) - {e}")
+        logger.info("SKIPPED: %s (%.3fs) - %s", key, duration, e)
 
     except Exception as e:
         duration = time.perf_counter() - t0
         status = "fail"
         exception = e
-        logger.error(f"FINISHED FAIL: {key} ({duration:.3f}s)\n{format_exception(e)}")
+        # formatting the traceback is expensive, skip it if the record would be discarded anyway
+        if logger.isEnabledFor(logging.ERROR):
+            logger.error("FINISHED FAIL: %s (%.3fs)\n%s", key, duration, format_exception(e))
 
     try:
         ctx.finish()
@@ -467,12 +779,13 @@ def run_test_collect_result(test: Test, ctx, logger, dry_run) -> TestResult:
     return TestResult(
         test=test,
         status=status,
-        logs=ctx.log_records,
+        logs=ctx.log_records if isinstance(ctx.log_records, list) else list(ctx.log_records),
         artifacts=ctx.artifacts,
         exception=exception,
         return_value=return_value,
         start_time=start_time,
         duration_s=duration,
+        dropped_logs=ctx.dropped_log_records,
     )
 
 
@@ -482,9 +795,7 @@ def _show_total_estimate(show_estimates, total_tests, tests: list[Test], test_du
         for test in tests:
             sum_known += test_durations.get(test.key, 0.0)
         if sum_known > 0:
-            logger.info(
-                f"Estimated total time: ~ {sum_known:.2g} seconds for {total_tests} tests"
-            )
+            logger.info("Estimated total time: ~ %.2g seconds for %d tests", sum_known, total_tests)
 
 
 def _show_estimate(show_estimates, test_durations, key, logger):
@@ -493,7 +804,7 @@ def _show_estimate(show_estimates, test_durations, key, logger):
         known_dur = test_durations.get(key, 0.0)
         if known_dur > TIME_REPORT_CUTOFF:
             est_str = f" (estimated ~ {known_dur:.2g} seconds)"
-        logger.info(f"STARTING: {key}{est_str}")
+        logger.info("STARTING: %s%s", key, est_str)
 
 
 def format_exception(exception: Exception) -> str:
@@ -505,13 +816,13 @@ def format_exception(exception: Exception) -> str:
 def setup_logging(quiet=False, verbose=False):
     # Create our formatter and handler
     root_logger = logging.getLogger()
-    live_format = SimpleLogFormatter()
-    live_handler = create_live_console_handler(formatter=live_format)
 
     # If quiet => set level above CRITICAL (so no logs)
     if quiet:
         root_logger.setLevel(logging.CRITICAL + 1)
     else:
+        live_format = SimpleLogFormatter(use_colors=_use_colors(sys.stdout))
+        live_handler = create_live_console_handler(formatter=live_format)
         level = logging.DEBUG if verbose else logging.INFO
         root_logger.setLevel(level)
         live_handler.setLevel(level)
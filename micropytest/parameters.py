@@ -2,15 +2,24 @@ import json
 from .decorators import parameterize
 
 class Args:
-    """A container to store function arguments."""
+    """A container to store function arguments.
+
+    The string and JSON representations are computed once and cached, the arguments must not be modified afterwards.
+    """
+    __slots__ = ("args", "kwargs", "_str", "_json")
+
     def __init__(self, *args, **kwargs):
         self.args = args
         self.kwargs = kwargs
+        self._str = None
+        self._json = None
 
     def __str__(self):
-        args = [repr(arg) for arg in self.args]
-        kwargs = [f"{k}={repr(v)}" for k, v in self.kwargs.items()]
-        return f"({', '.join(args + kwargs)})"
+        if self._str is None:
+            args = [repr(arg) for arg in self.args]
+            kwargs = [f"{k}={repr(v)}" for k, v in self.kwargs.items()]
+            self._str = f"({', '.join(args + kwargs)})"
+        return self._str
 
     def __repr__(self):
         return f"Args{str(self)}"
@@ -20,10 +29,12 @@ class Args:
 
     def to_json(self) -> str:
         """Canonical JSON serialization."""
-        d = {'args': list(self.args), 'kwargs': self.kwargs}
-        # sort keys and use most compact representation
-        # note that tuples in data will be converted to lists (irreversibly)
-        return json.dumps(d, sort_keys=True, separators=(',', ':'), ensure_ascii=False)
+        if self._json is None:
+            d = {'args': list(self.args), 'kwargs': self.kwargs}
+            # sort keys and use most compact representation
+            # note that tuples in data will be converted to lists (irreversibly)
+            self._json = json.dumps(d, sort_keys=True, separators=(',', ':'), ensure_ascii=False)
+        return self._json
 
     @staticmethod
     def from_json(s: str) -> "Args":
@@ -21,8 +21,16 @@ class TestStats:
             self.failed += 1
         elif status == "skip":
             self.skipped += 1
-        self.warnings += sum(1 for record in logs if record.levelname == "WARNING")
-        self.errors += sum(1 for record in logs if (record.levelname in ["ERROR", "CRITICAL"]))
+        # count warnings and errors in a single pass over the logs
+        warnings = errors = 0
+        for record in logs:
+            levelname = record.levelname
+            if levelname == "WARNING":
+                warnings += 1
+            elif levelname == "ERROR" or levelname == "CRITICAL":
+                errors += 1
+        self.warnings += warnings
+        self.errors += errors
         self.total_time += result.duration_s
         return self
 
@@ -1,6 +1,6 @@
 """Interface for storing test results on a remote server implementing the MicroPyTest Store REST API."""
 from typing import Optional, Union
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from datetime import datetime, timezone
 from urllib.parse import quote
 import os
@@ -8,12 +8,22 @@ import sys
 import subprocess
 import logging
 import json
-from pydantic import BaseModel, JsonValue, Base64Bytes, Field
-from typing import Literal, Annotated, Any
+import gzip
+from pydantic import BaseModel, JsonValue, Base64Bytes, Field, TypeAdapter
+from typing import Literal, Annotated, Any, BinaryIO, Iterable, Iterator
 import threading
 import _thread
-from time import sleep
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+import ctypes
+from time import monotonic, sleep
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+try:
+    import zstandard  # optional, needed for zstd request compression
+except ImportError:
+    zstandard = None
 from requests.exceptions import HTTPError
 from .types import Test, Args, TestResult, TestAttributes
 from .core import SkipTest, load_test_module_by_path, TestContext, format_exception
@@ -23,6 +33,15 @@ from .types import TestStatus
 ArtifactValue = Union[JsonValue, bytes]
 TestRunStatus = Literal["pass", "fail", "skip", "queued", "running", "cancelled"]
 LogLevel = Literal["DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL"]
+MAX_LOGS_PER_REQUEST = 1000
+HTTP_POOL_SIZE = 32  # maximum number of keep-alive connections per host
+HTTP_RETRIES = 3  # retries of failed connections and of idempotent requests answered with a gateway error
+COMPRESSION_MIN_SIZE = 4096  # only compress request bodies larger than this (in bytes)
+Compression = Literal["gzip", "zstd"]
+_vcs_helper = VCSHelper()  # shared by all LocalRepository.get() calls, so that VCS detection is cached
+_repo_roots: dict[str, str] = {}  # absolute path -> root directory of its repository
+_JSON_ADAPTER = TypeAdapter(Any)  # serializes plain request data (used where building models is too slow)
+_LOG_LEVEL_ADAPTER = TypeAdapter(LogLevel)  # validates log levels of plain log data
 
 
 class TestDefinition(BaseModel):
@@ -92,12 +111,22 @@ class EnqueueResponseData(BaseModel):
     run_id: int
 
 
+class EnqueueBatchRequestData(BaseModel):
+    tests: list[TestDefinition]
+    job_id: int
+
+
+class EnqueueBatchResponseData(BaseModel):
+    runs: list[EnqueueResponseData]  # in the same order as the tests in the request
+
+
 class StartRequestData(BaseModel):
     job_id: int
 
 
 class StartResponseData(BaseModel):
     test_run: Optional[TestRunData]
+    job_complete: bool = True  # False if more tests of the job might become available to start later
 
 
 class TypedJson(BaseModel):
@@ -136,6 +165,10 @@ class AddArtifactRequestData(BaseModel):
     value: JsonOrBytes
 
 
+class AddArtifactsRequestData(BaseModel):
+    artifacts: list[AddArtifactRequestData]
+
+
 class LogEntry(BaseModel):
     time: datetime
     level: LogLevel
@@ -165,6 +198,11 @@ class FinishTestRequestData(BaseModel):
     finish_reason: str
 
 
+class FinishAndStartRequestData(BaseModel):
+    finish: FinishTestRequestData
+    job_id: int
+
+
 class CancelTestRequestData(BaseModel):
     cancel: bool
 
@@ -249,13 +287,19 @@ class LocalRepository:
     commit: str
     branch: str
     root_path: str  # local path to the repository root directory
+    # (root_path, absolute root path, absolute root path with trailing separator), recomputed if root_path changes
+    _root_cache: Optional[tuple[str, str, str]] = field(default=None, init=False, repr=False, compare=False)
 
     @staticmethod
     def get(name: Optional[str] = None, path: str = ".") -> "LocalRepository":
         """Get the current repository."""
         path = os.path.abspath(path)
-        vcs = VCSHelper().get_vcs_handler(path)
-        repo_root = os.path.abspath(vcs.get_repo_root(path))
+        vcs = _vcs_helper.get_vcs_handler(path)
+        # the repository root of a path does not change, but commit and branch might (so they are queried every time)
+        repo_root = _repo_roots.get(path)
+        if repo_root is None:
+            repo_root = os.path.abspath(vcs.get_repo_root(path))
+            _repo_roots[path] = repo_root
         if name is None:
             name = os.path.basename(repo_root)
         return LocalRepository(
@@ -267,11 +311,28 @@ class LocalRepository:
 
     def relative_path(self, path: str) -> str:
         """Get relative path with respect to the repository root path."""
-        return os.path.relpath(os.path.abspath(path), os.path.abspath(self.root_path)).replace('\\', '/')
+        root, root_prefix = self._absolute_root()
+        path = os.path.abspath(path)
+        if path.startswith(root_prefix):
+            # fast path for paths inside the repository, which is the usual case
+            relative_path = path[len(root_prefix):]
+        else:
+            relative_path = os.path.relpath(path, root)
+        return relative_path.replace('\\', '/')
 
     def test_path(self, relative_path: str) -> str:
         """Get path relative to the current working directory (as stored in Test)."""
-        return os.path.relpath(os.path.abspath(os.path.join(self.root_path, relative_path)), os.getcwd())
+        root, _ = self._absolute_root()
+        return os.path.relpath(os.path.join(root, relative_path))
+
+    def _absolute_root(self) -> tuple[str, str]:
+        """Get the absolute root path, without and with trailing separator."""
+        cache = self._root_cache
+        if cache is None or cache[0] != self.root_path:
+            root = os.path.abspath(self.root_path)
+            cache = (self.root_path, root, os.path.join(root, ""))
+            self._root_cache = cache
+        return cache[1], cache[2]
 
 
 class TestStore:
@@ -283,6 +344,8 @@ class TestStore:
         job: Optional[int] = None,
         timeout: float = 10.0,
         use_binary_upload: bool = False,
+        compression: Optional[Compression] = None,  # compress large JSON request bodies (server must support it)
+        min_log_level: int = logging.NOTSET,  # logs below this level are not sent to the server
     ):
         self.url: str = url
         self.headers: dict[str, str] = headers or {}
@@ -291,13 +354,30 @@ class TestStore:
         self.job: Optional[int] = job  # job ID for the set of tests to be run
         self.timeout: float = timeout
         self.use_binary_upload: bool = use_binary_upload
+        if compression == "zstd" and zstandard is None:
+            raise ImportError("zstd compression requires the zstandard package")
+        self.compression: Optional[Compression] = compression
+        self.min_log_level: int = min_log_level
+        self._artifact_batch_supported: bool = True  # whether the server supports adding several artifacts at once
+        self._finish_and_start_supported: bool = True  # whether the server supports finish_and_start requests
+        self._enqueue_batch_supported: bool = True  # whether the server supports enqueueing several tests at once
         self._test_alive_daemon = TestAliveDaemon(url, headers)
-        self._session = requests.Session()
-        self._session_lock = threading.Lock()
+        self._session = _create_session()  # shared by all threads, each request uses its own pooled connection
         self._artifact_transmitter = AsyncArtifactTransmitter(self, transmit_interval=0.0)
-        self._log_transmitter = AsyncLogTransmitter(self, transmit_interval=5.0)
+        self._log_transmitter = AsyncLogTransmitter(self, transmit_interval=5.0, max_pending=MAX_LOGS_PER_REQUEST)
         self._disable_request_logging()
 
+    def close(self) -> None:
+        """Send pending artifacts and logs, then close the HTTP connections and stop the keep-alive daemon."""
+        try:
+            try:
+                self._artifact_transmitter.close()
+            finally:
+                self._log_transmitter.close()
+        finally:
+            self._session.close()
+            self._test_alive_daemon.close()
+
     def test_definition(self, test: Test) -> TestDefinition:
         return TestDefinition(
             repository_name=self.repository.name,
@@ -347,7 +427,7 @@ class TestStore:
         )
         response = self._post(url, json=d)
         self._raise_for_status(response, url)
-        return CreateJobResponseData.model_validate(response.json()).job_id
+        return CreateJobResponseData.model_validate_json(response.content).job_id
 
     def enqueue_test(self, test: Test) -> EnqueueResponseData:
         """Add a test to the queue to be run later."""
@@ -360,19 +440,46 @@ class TestStore:
         url = f"{self.url}/enqueue"
         response = self._post(url, json=d)
         self._raise_for_status(response, url)
-        return EnqueueResponseData.model_validate(response.json())
+        return EnqueueResponseData.model_validate_json(response.content)
 
-    def start_test(self) -> Optional[TestRun]:
-        """Get the next test from the queue to start execution (or None if there are no more tests to run)."""
+    def enqueue_tests(self, tests: list[Test]) -> list[EnqueueResponseData]:
+        """Add multiple tests to the queue to be run later (using a single request if the server supports it)."""
+        if self.job is None:
+            self.job = self.create_job()
+        if self._enqueue_batch_supported:
+            d = EnqueueBatchRequestData(
+                tests=[self.test_definition(test) for test in tests],
+                job_id=self.job,
+            )
+            url = f"{self.url}/enqueue_batch"
+            response = self._post(url, json=d)
+            if response.status_code not in (404, 405):
+                self._raise_for_status(response, url)
+                return EnqueueBatchResponseData.model_validate_json(response.content).runs
+            self._enqueue_batch_supported = False  # fall back to one request per test
+        return [self.enqueue_test(test) for test in tests]
+
+    def start_test(self, wait: bool = False, max_poll_interval: float = 2.0) -> Optional[TestRun]:
+        """Get the next test from the queue to start execution (or None if there are no more tests to run).
+
+        If wait is True and the queue is empty but the server reports that the job is not complete yet (e.g. other
+        runners are still enqueueing tests), poll the server with exponential backoff (up to max_poll_interval
+        seconds between requests) until a test can be started or the job is complete.
+        """
         # gets the next test matching the store's test job in the order of enqueueing
         url = f"{self.url}/start"
         d = StartRequestData(job_id=self.job)
-        response = self._post(url, json=d)
-        self._raise_for_status(response, url)
-        response_data = StartResponseData.model_validate(response.json())
-        if response_data.test_run is None:
-            return None
-        return self.to_test_run(response_data.test_run)
+        poll_interval = 0.05
+        while True:
+            response = self._post(url, json=d)
+            self._raise_for_status(response, url)
+            response_data = StartResponseData.model_validate_json(response.content)
+            if response_data.test_run is not None:
+                return self.to_test_run(response_data.test_run)
+            if not wait or response_data.job_complete:
+                return None
+            sleep(poll_interval)
+            poll_interval = min(poll_interval * 2, max_poll_interval)
 
     def add_artifact(self, run_id: int, key: str, value: ArtifactValue):
         """Add an artifact to a running test."""
@@ -381,14 +488,48 @@ class TestStore:
             self._add_artifact_binary(run_id, key, value)
             return
         url = f"{self.url}/runs/{run_id}/artifacts/add"
-        d = AddArtifactRequestData(
-            key=key,
-            value=TypedBytes.wrap(value) if isinstance(value, bytes) else TypedJson.wrap(value),
-        )
+        d = _to_add_artifact_request_data(key, value)
         response = self._post(url, d)
         self._raise_for_status(response, url)
 
-    def _add_artifact_binary(self, run_id: int, key: str, value: bytes):
+    def add_artifacts(self, run_id: int, artifacts: list[tuple[str, ArtifactValue]]):
+        """Add several artifacts to a running test (using a single request if the server supports it).
+
+        If a key occurs several times, only its last value is sent.
+        """
+        artifacts = list(dict(artifacts).items())
+        if self.use_binary_upload:
+            # binary artifacts are uploaded individually without JSON encoding
+            for key, value in artifacts:
+                if isinstance(value, bytes):
+                    self._add_artifact_binary(run_id, key, value)
+            artifacts = [(key, value) for key, value in artifacts if not isinstance(value, bytes)]
+        if len(artifacts) > 1 and self._artifact_batch_supported:
+            url = f"{self.url}/runs/{run_id}/artifacts/add_batch"
+            d = AddArtifactsRequestData(
+                artifacts=[_to_add_artifact_request_data(key, value) for key, value in artifacts],
+            )
+            response = self._post(url, d)
+            if response.status_code not in (404, 405):
+                self._raise_for_status(response, url)
+                return
+            self._artifact_batch_supported = False  # fall back to one request per artifact
+        for key, value in artifacts:
+            self.add_artifact(run_id, key, value)
+
+    def add_artifact_file(self, run_id: int, key: str, path: os.PathLike):
+        """Add the content of a file as bytes artifact to a running test.
+
+        With binary upload enabled, the file is streamed from disk instead of being read into memory first.
+        """
+        if not self.use_binary_upload:
+            with open(path, "rb") as f:
+                self.add_artifact(run_id, key, f.read())
+            return
+        with open(path, "rb") as f:
+            self._add_artifact_binary(run_id, key, f)
+
+    def _add_artifact_binary(self, run_id: int, key: str, value: Union[bytes, BinaryIO]):
         url = f"{self.url}/runs/{run_id}/artifacts/add/binary/{quote(key, safe='')}"
         response = self._post_binary(
             url,
@@ -401,9 +542,19 @@ class TestStore:
         """Add logs to a running test."""
         # This can be called by the TestContext
         url = f"{self.url}/runs/{run_id}/logs/add"
-        d = AddLogsRequestData(
-            logs=[LogEntry.from_record(record) for record in logs],
-        )
+        # plain data with the shape of AddLogsRequestData, validating a model per record is comparatively slow
+        d = {
+            "logs": [
+                {
+                    "time": datetime.fromtimestamp(record.created, tz=timezone.utc),
+                    "level": record.levelname,
+                    "message": record.getMessage(),
+                }
+                for record in logs
+            ],
+        }
+        for level in {log["level"] for log in d["logs"]}:
+            _LOG_LEVEL_ADAPTER.validate_python(level)  # like LogEntry, e.g. custom level names are rejected here
         response = self._post(url, json=d)
         self._raise_for_status(response, url)
 
@@ -411,19 +562,26 @@ class TestStore:
         """Push an artifact to be transmitted asynchronously."""
         self._artifact_transmitter.push(run_id, (key, value))
 
+    def push_artifact_file(self, run_id: int, key: str, path: os.PathLike):
+        """Transmit a file artifact after all artifacts pushed before it (blocks until the file was transmitted, as it
+        could otherwise be modified or deleted by the test in the meantime)."""
+        self._artifact_transmitter.finish(run_id)
+        self.add_artifact_file(run_id, key, path)
+
     def push_log(self, run_id: int, log: logging.LogRecord):
         """Push a log to be transmitted asynchronously."""
         self._log_transmitter.push(run_id, log)
 
-    def finish_logs_and_artifacts(self) -> None:
-        """Finish transmitting logs and artifacts (blocks until transmission is complete)."""
+    def finish_logs_and_artifacts(self, run_id: Optional[int] = None) -> None:
+        """Finish transmitting logs and artifacts of a test run, or of all test runs if run_id is None (blocks until
+        transmission is complete)."""
         transmit_error = None
         try:
-            self._artifact_transmitter.finish()
+            self._artifact_transmitter.finish(run_id)
         except Exception as e:
             transmit_error = RuntimeError(f"Error while finishing: during add_artifact: {e.__class__.__name__}: {e}")
         try:
-            self._log_transmitter.finish()
+            self._log_transmitter.finish(run_id)
         except Exception as e:
             transmit_error = RuntimeError(f"Error while finishing: during add_logs: {e.__class__.__name__}: {e}")
         if transmit_error is not None:
@@ -434,16 +592,34 @@ class TestStore:
 
         This does not include artifacts and logs, which are reported separately during the test is running.
         """
-        d = FinishTestRequestData(
-            status=result.status,
-            exception=format_exception(result.exception) if result.exception is not None else None,
-            duration=result.duration_s,
-            finish_reason=_to_finish_reason(result.exception),
-        )
+        d = _to_finish_request_data(result)
         url = f"{self.url}/runs/{run_id}/finish"
         response = self._put(url, json=d)
         self._raise_for_status(response, url)
 
+    def finish_and_start_test(
+        self, run_id: int, result: TestResult, wait: bool = False, max_poll_interval: float = 2.0
+    ) -> Optional[TestRun]:
+        """Finish a test run like finish_test() and get the next test like start_test(), using a single request if
+        the server supports it."""
+        if not self._finish_and_start_supported:
+            self.finish_test(run_id, result)
+            return self.start_test(wait=wait, max_poll_interval=max_poll_interval)
+        d = FinishAndStartRequestData(finish=_to_finish_request_data(result), job_id=self.job)
+        url = f"{self.url}/runs/{run_id}/finish_and_start"
+        response = self._post(url, json=d)
+        if response.status_code in (404, 405):
+            self._finish_and_start_supported = False  # fall back to separate finish and start requests
+            self.finish_test(run_id, result)
+            return self.start_test(wait=wait, max_poll_interval=max_poll_interval)
+        self._raise_for_status(response, url)
+        response_data = StartResponseData.model_validate_json(response.content)
+        if response_data.test_run is not None:
+            return self.to_test_run(response_data.test_run)
+        if not wait or response_data.job_complete:
+            return None
+        return self.start_test(wait=True, max_poll_interval=max_poll_interval)
+
     def cancel_test(self, run_id: int) -> None:
         """Cancel a test run."""
         url = f"{self.url}/runs/{run_id}/cancel"
@@ -511,7 +687,7 @@ class TestStore:
         url = f"{self.url}/runs/get"
         response = self._post(url, json=d)
         self._raise_for_status(response, url)
-        response_data = GetTestRunsResponseData.model_validate(response.json())
+        response_data = GetTestRunsResponseData.model_validate_json(response.content)
         return [self.to_test_run(run) for run in response_data.test_runs]
 
     def get_last_test_run(
@@ -538,9 +714,20 @@ class TestStore:
         url = f"{self.url}/runs/{run_id}/artifacts/get"
         response = self._post(url, json=d)
         self._raise_for_status(response, url)
-        response_data = GetArtifactsResponseData.model_validate(response.json())
+        response_data = GetArtifactsResponseData.model_validate_json(response.content)
         return {key: value.unwrap() for key, value in response_data.artifacts.items()}
 
+    def iter_artifacts(self, run_id: int, keys: Iterable[str]) -> Iterator[tuple[str, ArtifactValue]]:
+        """Get artifacts of a test run one at a time (one request per key).
+
+        Unlike get_artifacts(), only one artifact is held in memory at a time, which is useful for runs with many
+        large artifacts. The keys of a run are available as TestRun.artifact_keys (see get_test_runs()).
+        """
+        for key in keys:
+            artifacts = self.get_artifacts(run_id, key)
+            if key in artifacts:
+                yield key, artifacts.pop(key)
+
     def get_logs(self, run_id: int, level: Optional[Union[LogLevel, list[LogLevel]]] = None) -> list[LogEntry]:
         """Get logs of a test run.
 
@@ -551,7 +738,7 @@ class TestStore:
         url = f"{self.url}/runs/{run_id}/logs/get"
         response = self._post(url, json=d)
         self._raise_for_status(response, url)
-        response_data = GetLogsResponseData.model_validate(response.json())
+        response_data = GetLogsResponseData.model_validate_json(response.content)
         return response_data.logs
 
     def get_tests(self, test_attributes: TestAttributes) -> list[Test]:
@@ -564,36 +751,42 @@ class TestStore:
         url = f"{self.url}/tests/get"
         response = self._post(url, json=d)
         self._raise_for_status(response, url)
-        response_data = GetTestsResponseData.model_validate(response.json())
+        response_data = GetTestsResponseData.model_validate_json(response.content)
         return [self.to_test(td) for td in response_data.test_definitions]
 
     def _request(
         self,
         method: str,
         url: str,
-        json: Optional[BaseModel] = None,
-        data: Optional[bytes] = None,
+        json: Optional[Union[BaseModel, dict[str, Any]]] = None,
+        data: Optional[Union[bytes, BinaryIO]] = None,
         headers: Optional[dict[str, str]] = None,
     ) -> requests.Response:
-        json_data = dump_json(json) if json is not None else None
         request_headers = dict(self.headers)
+        if json is not None:
+            # serialize in a single pass with pydantic-core instead of dumping to a dict and encoding that
+            if isinstance(json, BaseModel):
+                data = json.model_dump_json().encode("utf-8")
+            else:
+                data = _JSON_ADAPTER.dump_json(json)
+            request_headers["Content-Type"] = "application/json"
+            if self.compression is not None and len(data) > COMPRESSION_MIN_SIZE:
+                data = compress(data, self.compression)
+                request_headers["Content-Encoding"] = self.compression
         if headers is not None:
             request_headers.update(headers)
-        with self._session_lock:
-            res = self._session.request(
-                method,
-                url,
-                json=json_data,
-                data=data,
-                headers=request_headers,
-                timeout=self.timeout,
-            )
-        return res
+        return self._session.request(
+            method,
+            url,
+            data=data,
+            headers=request_headers,
+            timeout=self.timeout,
+        )
 
-    def _post(self, url: str, json: Optional[BaseModel] = None) -> requests.Response:
+    def _post(self, url: str, json: Optional[Union[BaseModel, dict[str, Any]]] = None) -> requests.Response:
         return self._request("POST", url, json=json)
 
-    def _post_binary(self, url: str, data: bytes, headers: Optional[dict[str, str]] = None) -> requests.Response:
+    def _post_binary(self, url: str, data: Union[bytes, BinaryIO], headers: Optional[dict[str, str]] = None) -> requests.Response:
         return self._request("POST", url, data=data, headers=headers)
 
     def _put(self, url: str, json: Optional[BaseModel] = None) -> requests.Response:
@@ -605,7 +798,7 @@ class TestStore:
     def _raise_for_status(self, response: requests.Response, url: str):
         if not response.ok:
             try:
-                error_data = ErrorResponseData.model_validate(response.json())
+                error_data = ErrorResponseData.model_validate_json(response.content)
             except Exception:
                 error_data = None
             msg = f"HTTP error (status code {response.status_code} for {response.request.method} {url}):\n"
@@ -634,74 +827,127 @@ class TestStore:
 
 
 class AsyncTransmitter:
-    """Transmits items to the server asynchronously."""
-    def __init__(self, store: 'TestStore', transmit_interval: float = 5.0):
+    """Transmits items to the server asynchronously.
+
+    Pending items are sent in one batch per run once the oldest item has been pending for transmit_interval seconds,
+    as soon as max_pending items are queued, or when finish() is called. Items of several runs can be pending at the
+    same time (when tests are run concurrently), their batches are then sent in parallel by up to max_workers threads.
+    """
+    def __init__(
+        self, store: 'TestStore', transmit_interval: float = 5.0, max_pending: Optional[int] = None, max_workers: int = 4
+    ):
         self._store: TestStore = store
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="micropytest-transmit")
         self._transmit_interval = transmit_interval
-        self._pending_items: list[Any] = []
-        self._lock = threading.Lock()
-        self._current_run_id: Optional[int] = None
-        self._finish = False
+        self._max_pending = max_pending
+        self._pending_items: dict[int, list[Any]] = {}
+        self._num_pending = 0
+        self._cond = threading.Condition()
+        self._finishing: set[Optional[int]] = set()  # runs waiting in finish() (None stands for all runs)
+        self._errors: dict[int, Exception] = {}  # errors that occurred in the thread
+        self._closed = False
         self._thread = threading.Thread(target=self._run, daemon=True)
         self._thread.start()
-        self._error = None  # error that occurred in the thread
 
     def push(self, run_id: int, item: Any):
         """Push an item to be transmitted (non-blocking call that returns immediately)."""
-        with self._lock:
-            if self._is_ready():
-                self._current_run_id = run_id
-            if self._current_run_id != run_id:
-                # We could end up here if a KeyboardInterrupt happened and finish() was not called -> reset silently.
-                self._current_run_id = run_id
-                self._pending_items = []
-            self._pending_items.append(item)
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("Transmitter was closed")
+            self._pending_items.setdefault(run_id, []).append(item)
+            self._num_pending += 1
+            self._cond.notify()
+
+    def finish(self, run_id: Optional[int] = None):
+        """Send all pending items of a run (or of all runs if run_id is None) to the server (blocks until they were
+        sent)."""
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("Transmitter was closed")
+            self._finishing.add(run_id)
+            self._cond.notify()
+            while run_id in self._finishing:
+                self._cond.wait()
+            errors = self._pop_errors(run_id)
+        if len(errors) > 0:
+            raise errors[0]  # re-raise the error that occurred in the thread
 
-    def finish(self):
-        """Send all pending items to the server (blocks until all items were sent) and finishes current run."""
-        with self._lock:
-            self._finish = True
-        while True:
-            with self._lock:
-                if self._is_ready():
-                    break
-            sleep(0.05)
-        with self._lock:
-            self._finish = False
-            e = self._error
-            self._error = None
-        if e is not None:
-            raise e  # re-raise the error that occurred in the thread
-
-    def _is_ready(self) -> bool:
-        """Ready to accept items for a new run."""
-        return self._current_run_id is None and len(self._pending_items) == 0
+    def close(self):
+        """Send all pending items and stop the transmitting threads (blocks until they were stopped)."""
+        with self._cond:
+            if self._closed:
+                return  # already closed
+            self._closed = True
+            self._cond.notify()
+        self._thread.join()
+        self._executor.shutdown()
+        with self._cond:
+            errors = self._pop_errors(None)
+        if len(errors) > 0:
+            raise errors[0]  # re-raise the error that occurred in the thread
+
+    def _pop_errors(self, run_id: Optional[int]) -> list[Exception]:
+        """Remove and return the errors of a run (or of all runs if run_id is None), must be called with the lock
+        held."""
+        if run_id is None:
+            errors = list(self._errors.values())
+            self._errors.clear()
+            return errors
+        return [self._errors.pop(run_id)] if run_id in self._errors else []
+
+    def _wait_for_batch(self) -> set[Optional[int]]:
+        """Wait until a batch is due to be transmitted, return the set of runs waiting to be finished.
+
+        Must be called with the lock held.
+        """
+        deadline = None
+        while len(self._finishing) == 0 and not self._closed:
+            if self._num_pending == 0:
+                deadline = None
+                self._cond.wait()
+                continue
+            if self._max_pending is not None and self._num_pending >= self._max_pending:
+                break
+            if deadline is None:
+                deadline = monotonic() + self._transmit_interval
+            remaining = deadline - monotonic()
+            if remaining <= 0:
+                break
+            self._cond.wait(remaining)
+        return set(self._finishing)
 
     def _run(self):
-        slept = 0.0
-        sleep_interval = 0.05
-        transmit_interval = self._transmit_interval
-        while True:
-            with self._lock:
-                finish = self._finish
-            if slept >= transmit_interval or finish:
-                slept = 0.0
-                with self._lock:
-                    current_run_id = self._current_run_id
-                    pending_items = self._pending_items.copy()
-                    self._pending_items = []
-                error = None
-                if current_run_id is not None and len(pending_items) > 0:
+        closed = False
+        while not closed:
+            with self._cond:
+                finishing = self._wait_for_batch()
+                closed = self._closed  # the last batch contains all items pushed before close()
+                pending_items = self._pending_items
+                self._pending_items = {}
+                self._num_pending = 0
+            errors = {}
+            if len(pending_items) > 1:
+                futures = {
+                    run_id: self._executor.submit(self._transmit, run_id, items)
+                    for run_id, items in pending_items.items()
+                }
+                for run_id, future in futures.items():
                     try:
-                        self._transmit(current_run_id, pending_items)
+                        future.result()
                     except Exception as e:
-                        error = e
-                with self._lock:
-                    self._error = error
-                    if finish:
-                        self._current_run_id = None
-            sleep(sleep_interval)
-            slept += sleep_interval
+                        errors[run_id] = e
+            else:
+                for run_id, items in pending_items.items():
+                    try:
+                        self._transmit(run_id, items)
+                    except Exception as e:
+                        errors[run_id] = e
+            with self._cond:
+                for run_id, e in errors.items():
+                    self._errors.setdefault(run_id, e)
+                if len(finishing) > 0:
+                    self._finishing -= finishing
+                    self._cond.notify_all()
 
     def _transmit(self, run_id: int, items: list[Any]):
         """Transmit items to the server."""
@@ -711,7 +957,7 @@ class AsyncTransmitter:
 class AsyncLogTransmitter(AsyncTransmitter):
     """Transmits logs to the server asynchronously."""
     def _transmit(self, run_id: int, items: list[logging.LogRecord]):
-        max_items = 1000
+        max_items = MAX_LOGS_PER_REQUEST
         for i in range(0, len(items), max_items):
             items_batch = items[i:i+max_items]
             self._store.add_logs(run_id, items_batch)
@@ -720,28 +966,86 @@ class AsyncLogTransmitter(AsyncTransmitter):
 class AsyncArtifactTransmitter(AsyncTransmitter):
     """Transmits artifacts to the server asynchronously."""
     def _transmit(self, run_id: int, items: list[tuple[str, ArtifactValue]]):
-        for key, value in items:
-            self._store.add_artifact(run_id, key, value)
+        self._store.add_artifacts(run_id, items)
 
 
 class TestContextStored(TestContext):
-    """A test context that stores artifacts and logs in the test store."""
+    """A test context that stores artifacts and logs in the test store.
+
+    Set the environment variable MICROPYTEST_NO_ARTIFACTS or MICROPYTEST_NO_LOGS to skip sending artifacts or logs
+    to the store (e.g. for quick smoke test runs). They are still recorded locally in the context.
+    """
     def __init__(self, store: TestStore, run_id: Optional[int] = None):
         super().__init__()
         self.store: TestStore = store
         self.run_id: int = run_id
+        self.send_artifacts: bool = not _env_flag("MICROPYTEST_NO_ARTIFACTS")
+        self.send_logs: bool = not _env_flag("MICROPYTEST_NO_LOGS")
+
+    def begin(self, run_id: int):
+        """Start recording for the test run with the given ID, so one context can be reused for consecutive runs."""
+        self.run_id = run_id
+        # bind new containers instead of clearing them, results of previous runs still reference the old ones
+        self.log_records = self._new_log_records()
+        self.artifacts = {}
+
+    def end(self):
+        """Stop recording for the current test run (counterpart of begin)."""
+        self.run_id = None
 
     def add_artifact(self, key: str, value: Any):
         super().add_artifact(key, value)
-        self.store.push_artifact(self.run_id, key, value)
+        if self.send_artifacts:
+            self.store.push_artifact(self.run_id, key, value)
 
     def add_log(self, record: logging.LogRecord):
         super().add_log(record)
-        self.store.push_log(self.run_id, record)
+        # check the level before queueing so that filtered records are never formatted or serialized
+        if self.send_logs and record.levelno >= self.store.min_log_level:
+            self.store.push_log(self.run_id, record)
+
+    def add_artifact_file(self, key: str, path: os.PathLike):
+        """Send the content of a file as bytes artifact to the store.
+
+        Unlike TestContext.add_artifact_file, only the file path is kept in the local artifacts, so large files are
+        not kept in memory. With binary upload enabled, the file is also streamed from disk instead of being read.
+        """
+        super().add_artifact(key, os.fspath(path))  # local artifact only, the content is sent below
+        if not self.send_artifacts:
+            return
+        if self.store.use_binary_upload:
+            self.store.push_artifact_file(self.run_id, key, path)
+        else:
+            with open(path, "rb") as f:
+                self.store.push_artifact(self.run_id, key, f.read())
 
     def finish(self):
         super().finish()
-        self.store.finish_logs_and_artifacts()
+        self.store.finish_logs_and_artifacts(self.run_id)
+
+
+def _create_session() -> requests.Session:
+    """Create an HTTP session that reuses keep-alive connections to the server.
+
+    Failed connection attempts are retried, as are idempotent requests that get a gateway error (POST requests are
+    never resent once they reached the server, to avoid e.g. enqueueing tests twice).
+    """
+    session = requests.Session()
+    retries = Retry(
+        total=HTTP_RETRIES,
+        backoff_factor=0.1,
+        status_forcelist=[502, 503, 504],
+        raise_on_status=False,  # return the last response, so that errors are reported as usual
+    )
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=HTTP_POOL_SIZE, max_retries=retries)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+def _env_flag(name: str) -> bool:
+    """Check if an environment variable is set to a value other than empty or "0"."""
+    return os.environ.get(name, "") not in ("", "0")
 
 
 def _to_list(value, default):
@@ -752,6 +1056,22 @@ def _to_list(value, default):
     return value
 
 
+def _to_add_artifact_request_data(key: str, value: ArtifactValue) -> AddArtifactRequestData:
+    return AddArtifactRequestData(
+        key=key,
+        value=TypedBytes.wrap(value) if isinstance(value, bytes) else TypedJson.wrap(value),
+    )
+
+
+def _to_finish_request_data(result: TestResult) -> FinishTestRequestData:
+    return FinishTestRequestData(
+        status=result.status,
+        exception=format_exception(result.exception) if result.exception is not None else None,
+        duration=result.duration_s,
+        finish_reason=_to_finish_reason(result.exception),
+    )
+
+
 def _to_finish_reason(exception: Optional[Exception]) -> str:
     if exception is None:
         finish_reason = "finished normally"
@@ -764,8 +1084,9 @@ def _to_finish_reason(exception: Optional[Exception]) -> str:
     return finish_reason
 
 
+@lru_cache(maxsize=None)
 def get_current_platform() -> Literal["windows", "linux", "macos"]:
-    """Get the current platform."""
+    """Get the current platform (determined once)."""
     platform = sys.platform
     if platform.startswith("win"):
         return "windows"
@@ -783,24 +1104,46 @@ class KeepAlive:
         self.run_id = run_id
 
     def __enter__(self):
-        # report to daemon that test run id is running
+        # report to daemon that test run id is running (in the current thread)
         self.store._test_alive_daemon.start(self.run_id)
 
     def __exit__(self, exc_type, exc_value, traceback):
         # report to daemon that test run id is finished
-        self.store._test_alive_daemon.stop()
+        self.store._test_alive_daemon.stop(self.run_id)
 
 
 class TestAliveDaemon:
     """Persistent subprocess that sends keep-alive messages to the server periodically.
-    The subprocess is terminated when the TestStore object goes out of scope.
+    The subprocess is terminated when the TestStore is closed or goes out of scope.
+
+    Starting a run is only reported to the subprocess after start_delay seconds, so runs that finish earlier (which
+    the server does not need keep-alive messages for) cause no messages at all. The subprocess itself is only started
+    when the first run is reported, so it is not started at all for stores that are only used to query results or
+    that only run short tests.
+
+    Multiple test runs can be alive at the same time. If a run is cancelled on the server, KeyboardInterrupt is raised
+    in the thread that started it.
     """
-    def __init__(self, api_endpoint, headers):
+    def __init__(self, api_endpoint, headers, start_delay: float = 1.0):
+        self._api_endpoint = api_endpoint
+        self._headers = headers
+        self._start_delay = start_delay
+        self.proc: Optional[subprocess.Popen] = None
+        self.thread: Optional[threading.Thread] = None
+        self._closed = False
+        self._run_threads: dict[int, int] = {}  # run id -> id of the thread running the test
+        self._lock = threading.Lock()
+        self._cond = threading.Condition()  # guards the subprocess, pending starts and the closed flag
+        self._pending_starts: dict[int, float] = {}  # run id -> time when the start is reported
+        self._flush_thread: Optional[threading.Thread] = None
+
+    def _start_process(self):
+        """Start the subprocess (must be called with the condition lock held)."""
         daemon_file = os.path.join(os.path.dirname(__file__), "utils", "daemon.py")
         env = os.environ.copy()
-        env["HTTP_HEADERS"] = json.dumps(headers)
+        env["HTTP_HEADERS"] = json.dumps(self._headers)
         self.proc = subprocess.Popen(
-            [sys.executable, daemon_file, api_endpoint],
+            [sys.executable, daemon_file, self._api_endpoint],
             stdin=subprocess.PIPE,
             stdout=subprocess.PIPE,
             stderr=subprocess.DEVNULL,
@@ -814,31 +1157,113 @@ class TestAliveDaemon:
     def _read_child_output(self):
         """Monitor child's stdout for cancel signal"""
         for line in self.proc.stdout:
-            line = line.strip()
-            if line == "cancel":
-                # Trigger KeyboardInterrupt in main thread
-                _thread.interrupt_main()
-
-    def _write(self, line: str):
+            parts = line.split()
+            if len(parts) == 2 and parts[0] == "cancel":
+                with self._lock:
+                    thread_id = self._run_threads.get(int(parts[1]))
+                if thread_id is not None and not _interrupt_thread(thread_id):
+                    logging.getLogger().warning("Could not cancel test run %s, its thread is not running", parts[1])
+
+    def _write(self, lines: list[str]):
+        """Write lines to the subprocess, starting it if needed (must be called with the condition lock held)."""
+        if self.proc is None:
+            self._start_process()
         if self.proc.poll() is not None:
             raise RuntimeError("Keep-alive daemon process is not running")
-        self.proc.stdin.write(line)
+        self.proc.stdin.write("".join(lines))
         self.proc.stdin.flush()
 
-    def start(self, run_id: int):
-        self._write(f"start {run_id}\n")
+    def _flush_pending_starts(self):
+        """Report pending starts once they are due (runs in a background thread until the daemon is closed)."""
+        with self._cond:
+            while not self._closed:
+                now = monotonic()
+                due = [run_id for run_id, due_time in self._pending_starts.items() if due_time <= now]
+                if len(due) > 0:
+                    for run_id in due:
+                        del self._pending_starts[run_id]
+                    try:
+                        self._write([f"start {run_id}\n" for run_id in due])
+                    except (RuntimeError, OSError):
+                        pass  # the subprocess exited, the next start() or stop() raises
+                if len(self._pending_starts) > 0:
+                    self._cond.wait(min(self._pending_starts.values()) - now)
+                else:
+                    self._cond.wait()
 
-    def stop(self):
-        self._write("stop\n")
+    def start(self, run_id: int):
+        with self._lock:
+            self._run_threads[run_id] = threading.get_ident()
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("Keep-alive daemon was closed")
+            if self.proc is not None and self.proc.poll() is not None:
+                raise RuntimeError("Keep-alive daemon process is not running")
+            self._pending_starts[run_id] = monotonic() + self._start_delay
+            if self._flush_thread is None:
+                self._flush_thread = threading.Thread(target=self._flush_pending_starts, daemon=True)
+                self._flush_thread.start()
+            self._cond.notify()
+
+    def stop(self, run_id: Optional[int] = None):
+        """Stop sending keep-alive messages for a run (or for all runs if run_id is None)."""
+        with self._lock:
+            if run_id is None:
+                self._run_threads.clear()
+            else:
+                self._run_threads.pop(run_id, None)
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("Keep-alive daemon was closed")
+            if run_id is None:
+                self._pending_starts.clear()
+            elif self._pending_starts.pop(run_id, None) is not None:
+                return  # the start was not reported yet, so there is nothing to stop
+            if self.proc is None:
+                return  # no run was reported yet
+            self._write(["stop\n" if run_id is None else f"stop {run_id}\n"])
 
     def close(self):
-        # closing stdin will cause the child process to exit
-        self.proc.stdin.close()
+        with self._cond:
+            if self._closed:
+                return  # already closed
+            self._closed = True
+            self._pending_starts.clear()
+            self._cond.notify()
+            if self.proc is None:
+                return  # the subprocess was never started
+            # closing stdin will cause the child process to exit
+            self.proc.stdin.close()
         self.proc.wait()  # wait for child to actually exit
         self.thread.join()
 
     def __del__(self):
-        self.close()
+        if getattr(self, "_cond", None) is not None:  # __init__ might not have completed
+            self.close()
+
+
+def compress(data: bytes, compression: Compression) -> bytes:
+    """Compress a request body with the given content encoding."""
+    if compression == "gzip":
+        return gzip.compress(data, compresslevel=6)
+    elif compression == "zstd":
+        return zstandard.ZstdCompressor(level=3).compress(data)
+    else:
+        raise ValueError(f"Unknown compression: {compression}")
+
+
+def _interrupt_thread(thread_id: int) -> bool:
+    """Raise KeyboardInterrupt in the given thread (returns False if the thread does not exist)."""
+    if thread_id == threading.main_thread().ident:
+        _thread.interrupt_main()
+        return True
+    # thread idents are unsigned longs (see threading.get_ident)
+    count = ctypes.pythonapi.PyThreadState_SetAsyncExc(ctypes.c_ulong(thread_id), ctypes.py_object(KeyboardInterrupt))
+    if count > 1:
+        # more than one thread state was modified, revert as documented for PyThreadState_SetAsyncExc
+        ctypes.pythonapi.PyThreadState_SetAsyncExc(ctypes.c_ulong(thread_id), None)
+        return False
+    return count == 1
 
 
 def dump_json(obj: BaseModel) -> Any:
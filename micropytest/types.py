@@ -62,3 +62,4 @@ class TestResult:
     return_value: Any
     start_time: datetime
     duration_s: float
+    dropped_logs: int = 0  # number of log records not included in logs (see TestContext.max_log_records)
@@ -4,7 +4,6 @@ It sends keep-alive messages to an API endpoint periodically.
 """
 import sys
 import os
-import time
 import threading
 import json
 import requests
@@ -20,40 +19,49 @@ def main():
     api_endpoint = sys.argv[1]
     session = requests.Session()
 
-    run_id = None
+    run_ids: set[int] = set()  # test runs that are currently running
     lock = threading.Lock()
+    exit_event = threading.Event()
     parent_pid = os.getppid()
     print(f"Started keep-alive daemon pid={os.getpid()} parent_pid={parent_pid}", file=sys.stderr)
 
-    def sleep_responsive(t: float):
-        """Sleep for t seconds and return run_id, returns early if run_id is None or -1."""
-        slept = 0.0
-        sleep_time = 0.1
-        while True:
-            time.sleep(sleep_time)
-            slept += sleep_time
-            with lock:
-                rid = run_id
-            if slept >= t or rid is None or rid == -1:
-                break
-        return rid
-
     def worker():
-        nonlocal run_id
-        while True:
-            rid = sleep_responsive(ALIVE_INTERVAL)
-            if rid is None:
-                continue
-            if rid == -1:
-                break  # main thread exited loop
-            print(f"Sending keep-alive for run {rid}", file=sys.stderr)
-            cancel = send_running_alive(rid, api_endpoint, session)
-            if cancel:
-                print("Got cancel: sending cancel to parent process via stdout", file=sys.stderr)
-                print("cancel")
+        batch_supported = True  # whether the server supports reporting multiple runs in one request
+        while not exit_event.wait(ALIVE_INTERVAL):
+            with lock:
+                rids = sorted(run_ids)
+            cancelled = None
+            if len(rids) > 1 and batch_supported:
+                print(f"Sending keep-alive for runs {rids}", file=sys.stderr)
+                try:
+                    cancelled = send_running_alive_batch(rids, api_endpoint, session)
+                except requests.HTTPError as e:
+                    if e.response is None or e.response.status_code not in (404, 405):
+                        print(f"Batch keep-alive failed: {e}", file=sys.stderr)
+                        continue
+                    print("Server does not support batch keep-alive, falling back to one request per run",
+                          file=sys.stderr)
+                    batch_supported = False
+                except requests.RequestException as e:
+                    # the session reconnects on the next request, try again after the next interval
+                    print(f"Batch keep-alive failed: {e}", file=sys.stderr)
+                    continue
+            if cancelled is None:
+                cancelled = []
+                for rid in rids:
+                    print(f"Sending keep-alive for run {rid}", file=sys.stderr)
+                    try:
+                        if send_running_alive(rid, api_endpoint, session):
+                            cancelled.append(rid)
+                    except requests.RequestException as e:
+                        # the session reconnects on the next request, keep pinging the other runs
+                        print(f"Keep-alive for run {rid} failed: {e}", file=sys.stderr)
+            for rid in cancelled:
+                print(f"Got cancel for run {rid}: sending cancel to parent process via stdout", file=sys.stderr)
+                print(f"cancel {rid}")
                 sys.stdout.flush()
                 with lock:
-                    run_id = None
+                    run_ids.discard(rid)
 
     thread = threading.Thread(target=worker, daemon=True)
     thread.start()
@@ -62,19 +70,18 @@ def main():
         line = sys.stdin.readline()
         if line == '':
             # parent exited or closed stdin -> exit
-            with lock:
-                run_id = -1  # request thread to exit
+            exit_event.set()  # request thread to exit
             break
         line = line.strip()
         print(f"Received command: {line}", file=sys.stderr)
+        parts = line.split()
         with lock:
-            if line.startswith("start "):
-                parts = line.split()
-                if len(parts) == 2:
-                    if run_id is None:
-                        run_id = int(parts[1])
+            if len(parts) == 2 and parts[0] == "start":
+                run_ids.add(int(parts[1]))
+            elif len(parts) == 2 and parts[0] == "stop":
+                run_ids.discard(int(parts[1]))
             elif line == "stop":
-                run_id = None
+                run_ids.clear()
 
     thread.join()
     sys.stdout.flush()
@@ -90,5 +97,13 @@ def send_running_alive(run_id: int, url: str, session: requests.Session) -> bool
     return response.json()['cancel']
 
 
+def send_running_alive_batch(run_ids: list[int], url: str, session: requests.Session) -> list[int]:
+    """Report to server that several tests are still running, return the ids of the runs cancelled server side."""
+    url = f"{url}/runs/alive"
+    response = session.put(url, json={"run_ids": run_ids}, headers=HTTP_HEADERS, timeout=REQUEST_TIMEOUT)
+    response.raise_for_status()
+    return response.json()['cancel']
+
+
 if __name__ == "__main__":
     main()
@@ -2,13 +2,13 @@
 
 import subprocess
 import time
-from datetime import datetime
 import xml.etree.ElementTree as ET
 from abc import ABC, abstractmethod
 from typing import Optional
 import os
 from os import PathLike
 from dataclasses import dataclass
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 import re
 
@@ -20,7 +20,7 @@ class VCSInfo:
 
     @property
     def date(self) -> str:
-        return datetime.fromtimestamp(self.timestamp).strftime('%Y-%m-%d %H:%M:%S')
+        return time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(self.timestamp))
 
 
 @dataclass
@@ -90,6 +90,7 @@ class ChangeSet:
 class VCSInterface(ABC):
     """Abstract base class defining the interface for VCS operations."""
     name = None
+    marker = None  # name of the metadata directory in the root of a working copy (used to speed up detection)
 
     @abstractmethod
     def is_used(self, file_path: PathLike) -> bool:
@@ -101,6 +102,13 @@ class VCSInterface(ABC):
         """Get the creator of a file."""
         pass
 
+    def get_file_creators(self, file_paths: list[PathLike]) -> dict[PathLike, VCSInfo]:
+        """Get the creators of several files (maps each given path to its creator).
+
+        Implementations can override this to query all files at once instead of one query per file.
+        """
+        return {file_path: self.get_file_creator(file_path) for file_path in file_paths}
+
     @abstractmethod
     def get_last_modifier(self, file_path: PathLike) -> VCSInfo:
         """Get the last person who modified a file."""
@@ -111,6 +119,13 @@ class VCSInterface(ABC):
         """Get the author of a specific line."""
         pass
 
+    def get_line_authors(self, file_path: PathLike, line_numbers: list[int]) -> dict[int, VCSInfo]:
+        """Get the authors of several lines (maps line number to author).
+
+        Implementations can override this to query all lines at once instead of one query per line.
+        """
+        return {line_number: self.get_line_author(file_path, line_number) for line_number in line_numbers}
+
     @abstractmethod
     def get_line_commit_message(self, file_path: PathLike, line_number: int) -> str:
         """Get the commit message for a specific line."""
@@ -121,6 +136,23 @@ class VCSInterface(ABC):
         """Get file history (last N changes)."""
         pass
 
+    def get_file_histories(self, file_paths: list[PathLike], limit: int = 5,
+                           max_workers: Optional[int] = None) -> dict[PathLike, list[VCSHistoryEntry]]:
+        """Get the histories of several files (maps each given path to its last N changes).
+
+        The queries run in parallel in up to max_workers threads (defaults to the number of CPUs), since each one
+        mostly waits for a VCS subprocess.
+        """
+        file_paths = list(file_paths)
+        if max_workers is None:
+            max_workers = os.cpu_count() or 1
+        max_workers = min(max_workers, len(file_paths))
+        if max_workers <= 1:
+            return {file_path: self.get_file_history(file_path, limit) for file_path in file_paths}
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            histories = executor.map(lambda file_path: self.get_file_history(file_path, limit), file_paths)
+            return dict(zip(file_paths, histories))
+
     @abstractmethod
     def get_last_commit(self, repo_path: PathLike) -> VCSHistoryEntry:
         """Get information about the last commit."""
@@ -150,6 +182,10 @@ class VCSError(Exception):
 class GitVCS(VCSInterface):
     """Git implementation of the VCS interface."""
     name = "git"
+    marker = ".git"  # a directory, or a file in worktrees and submodules
+
+    def __init__(self):
+        self._commit_messages: dict[str, str] = {}  # commit hash -> message (commits are immutable)
 
     def is_used(self, file_path) -> bool:
         """Check if Git is used for the given file."""
@@ -182,6 +218,43 @@ class GitVCS(VCSInterface):
 
         raise VCSError("Could not determine file creator")
 
+    def get_file_creators(self, file_paths):
+        """Get the creators of several files in Git using a single traversal of the history."""
+        if len(file_paths) <= 1:
+            return super().get_file_creators(file_paths)
+        creators = {}  # path relative to the repository root -> creator
+        try:
+            repo_root = subprocess.run(
+                ['git', 'rev-parse', '--show-toplevel'], capture_output=True, text=True, check=True
+            ).stdout.strip()
+            # oldest commit first, commit lines are marked with a NUL character, followed by the names of the files
+            result = subprocess.run(
+                ['git', '-c', 'core.quotepath=off', 'log', '--format=%x00%an|%ae|%at', '--name-only', '--reverse',
+                 '--', *file_paths],
+                capture_output=True, text=True, check=True
+            )
+            author = None
+            for line in result.stdout.splitlines():
+                if line.startswith('\0'):
+                    name, email, timestamp = line[1:].rsplit('|', 2)
+                    author = VCSInfo(name=name, email=email, timestamp=int(timestamp))
+                elif line and author is not None:
+                    creators.setdefault(line, author)
+        except (subprocess.SubprocessError, ValueError):
+            pass
+
+        result = {}
+        for file_path in file_paths:
+            creator = None
+            if len(creators) > 0:
+                rel_path = os.path.relpath(os.path.abspath(file_path), repo_root).replace('\\', '/')
+                creator = creators.get(rel_path)
+            if creator is None:
+                # files that could not be matched are queried individually (raising VCSError if there is no creator)
+                creator = self.get_file_creator(file_path)
+            result[file_path] = creator
+        return result
+
     def get_last_modifier(self, file_path):
         """Get the last person who modified a file in Git."""
         try:
@@ -232,6 +305,50 @@ class GitVCS(VCSInterface):
 
         raise VCSError("No line author information found")
 
+    def get_line_authors(self, file_path, line_numbers):
+        """Get the authors of several lines in Git (with a single git blame call)."""
+        if len(line_numbers) == 0:
+            return {}
+        ranges = []
+        for line_number in line_numbers:
+            ranges += ['-L', f"{line_number},{line_number}"]
+        try:
+            result = subprocess.run(
+                ['git', 'blame', *ranges, '--line-porcelain', '--', file_path],
+                capture_output=True, text=True, check=True
+            )
+        except subprocess.SubprocessError:
+            raise VCSError("No line author information found")
+
+        # each line starts with a header "<hash> <original line> <final line> ...", followed by the commit
+        # information and the content of the line prefixed by a tab
+        authors: dict[int, VCSInfo] = {}
+        final_line = None
+        author = None
+        email = None
+        timestamp = None
+        for line in result.stdout.split('\n'):
+            if final_line is None:
+                parts = line.split(' ')
+                if len(parts) >= 3:
+                    final_line = int(parts[2])
+                    author = email = timestamp = None
+            elif line.startswith('\t'):
+                if author is None or email is None or timestamp is None:
+                    raise VCSError("Could not determine line author")
+                authors[final_line] = VCSInfo(name=author, email=email, timestamp=timestamp)
+                final_line = None
+            elif line.startswith('author '):
+                author = line[7:].strip()
+            elif line.startswith('author-mail '):
+                email = line[12:].strip().strip('<>')
+            elif line.startswith('author-time '):
+                timestamp = int(line[11:].strip())
+
+        if any(line_number not in authors for line_number in line_numbers):
+            raise VCSError("Could not determine line author")
+        return authors
+
     def get_line_commit_message(self, file_path, line_number):
         """Get the commit message for a specific line in Git."""
         try:
@@ -243,13 +360,16 @@ class GitVCS(VCSInterface):
 
             commit_hash = blame_result.stdout.split('\n')[0].split(' ')[0]
 
-            # Now get the commit message
-            msg_result = subprocess.run(
-                ['git', 'show', '-s', '--format=%B', commit_hash],
-                capture_output=True, text=True, check=True
-            )
-
-            return msg_result.stdout.strip()
+            # Now get the commit message (lines often share commits, so it is only queried once per commit)
+            message = self._commit_messages.get(commit_hash)
+            if message is None:
+                msg_result = subprocess.run(
+                    ['git', 'show', '-s', '--format=%B', commit_hash],
+                    capture_output=True, text=True, check=True
+                )
+                message = msg_result.stdout.strip()
+                self._commit_messages[commit_hash] = message
+            return message
         except subprocess.SubprocessError:
             raise VCSError("Could not determine commit message")
 
@@ -348,6 +468,7 @@ class GitVCS(VCSInterface):
 class SVNVCS(VCSInterface):
     """SVN implementation of the VCS interface."""
     name = "svn"
+    marker = ".svn"
 
     def is_used(self, file_path) -> bool:
         """Check if SVN is used for the given file."""
@@ -475,6 +596,56 @@ class SVNVCS(VCSInterface):
 
         raise VCSError("Could not determine line author")
 
+    def get_line_authors(self, file_path, line_numbers):
+        """Get the authors of several lines in SVN (with a single blame call and one log call per revision)."""
+        try:
+            flags = self._get_flags()
+            file_url = self._get_file_url(file_path)
+            rev = self._get_working_copy_revision(file_path)
+            result = subprocess.run(
+                arg('svn', 'blame', *flags, "-r", rev, file_url),
+                capture_output=True, text=True, check=True
+            )
+
+            lines = result.stdout.split('\n')
+            line_revisions = {}
+            for line_number in line_numbers:
+                if not 0 <= line_number - 1 < len(lines):
+                    raise VCSError("Could not determine line author")
+                parts = lines[line_number - 1].strip().split()
+                if len(parts) < 2:
+                    raise VCSError("Could not determine line author")
+                line_revisions[line_number] = (parts[0], parts[1])
+
+            # Get the date of each revision only once
+            timestamps = {}
+            for revision, _ in set(line_revisions.values()):
+                log_result = subprocess.run(
+                    arg('svn', 'log', *flags, '-r', revision, file_url),
+                    capture_output=True, text=True, check=True
+                )
+                date_str = None
+                for log_line in log_result.stdout.split('\n'):
+                    if log_line.startswith('r') and '|' in log_line:
+                        date_str = log_line.split('|')[2].strip()
+                        break
+                if date_str is None:
+                    raise VCSError("Could not determine line author date")
+                timestamps[revision] = int(time.mktime(time.strptime(date_str[:19], '%Y-%m-%d %H:%M:%S')))
+
+            return {
+                line_number: VCSInfo(
+                    name=author,
+                    email=None,  # SVN doesn't store emails by default
+                    timestamp=timestamps[revision],
+                )
+                for line_number, (revision, author) in line_revisions.items()
+            }
+        except subprocess.SubprocessError:
+            pass
+
+        raise VCSError("Could not determine line author")
+
     def get_line_commit_message(self, file_path, line_number) -> str:
         """Get the commit message for a specific line in SVN."""
         try:
@@ -731,6 +902,7 @@ class VCSHelper:
         if handlers is None:
             handlers = [SVNVCS(), GitVCS()]
         self.handlers = handlers
+        self._handler_cache: dict[str, VCSInterface] = {}  # absolute path -> detected handler
 
     def detect_vcs(self, path) -> Optional[str]:
         """Detect which version control system is being used."""
@@ -738,12 +910,55 @@ class VCSHelper:
         return h.name if h else None
 
     def get_vcs_handler(self, path) -> Optional[VCSInterface]:
-        """Get the appropriate VCS implementation based on the repository type."""
-        for handler in self.handlers:
+        """Get the appropriate VCS implementation based on the repository type.
+
+        Detected handlers are cached per path, paths without a detected VCS are checked again on the next call.
+        Handlers whose working copy marker is found in the nearest parent directory are tried first, so that e.g. a
+        Git repository does not have to be probed with SVN commands first.
+        """
+        key = os.path.abspath(str(path))
+        handler = self._handler_cache.get(key)
+        if handler is not None:
+            return handler
+        for handler in self._ordered_handlers(key):
             if handler.is_used(path):
+                self._handler_cache[key] = handler
                 return handler
         return None
 
+    def get_file_histories(self, file_paths: list[PathLike], limit: int = 5,
+                           max_workers: Optional[int] = None) -> dict[PathLike, list[VCSHistoryEntry]]:
+        """Get the histories of several files, which can be in different repositories (queried in parallel)."""
+        by_handler: dict[VCSInterface, list[PathLike]] = {}
+        for file_path in file_paths:
+            handler = self.get_vcs_handler(os.path.dirname(os.path.abspath(file_path)))
+            if handler is None:
+                raise VCSError(f"No VCS detected for {file_path}")
+            by_handler.setdefault(handler, []).append(file_path)
+        histories = {}
+        for handler, paths in by_handler.items():
+            histories.update(handler.get_file_histories(paths, limit, max_workers))
+        return histories
+
+    def _ordered_handlers(self, path: str) -> list[VCSInterface]:
+        """Sort handlers by the distance to the nearest parent directory containing their marker (stable sort, all
+        handlers are kept since a working copy can also be configured without a marker, e.g. with GIT_DIR)."""
+        distances = {}
+        remaining = {handler.marker for handler in self.handlers if handler.marker is not None}
+        directory = path if os.path.isdir(path) else os.path.dirname(path)
+        distance = 0
+        while len(remaining) > 0:
+            for marker in list(remaining):
+                if os.path.exists(os.path.join(directory, marker)):
+                    distances[marker] = distance
+                    remaining.discard(marker)
+            parent = os.path.dirname(directory)
+            if parent == directory:
+                break
+            directory = parent
+            distance += 1
+        return sorted(self.handlers, key=lambda handler: distances.get(handler.marker, float("inf")))
+
 
 def arg(*args):
     return list(args)